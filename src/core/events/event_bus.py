@@ -77,6 +77,30 @@ class EventBus:
             logger.error(f"Failed to publish event: {e}")
             raise
     
+    async def publish_many(self, events: List[Event]) -> List[str]:
+        """
+        Publish several events with a single insert.
+        
+        Args:
+            events: The events to publish
+            
+        Returns:
+            The event IDs, in the same order as the events
+        """
+        if not events:
+            return []
+            
+        try:
+            await self.collection.insert_many(
+                [event.to_dict() for event in events],
+                ordered=False
+            )
+            logger.debug(f"Published batch of {len(events)} events")
+            return [event.event_id for event in events]
+        except PyMongoError as e:
+            logger.error(f"Failed to publish event batch: {e}")
+            raise
+    
     def subscribe(self, event_type: EventType, handler: Callable) -> None:
         """
         Subscribe to a specific event type.
@@ -90,15 +114,33 @@ class EventBus:
         self.handlers[event_type].append(handler)
         logger.debug(f"Subscribed handler to {event_type}")
     
-    def subscribe_all(self, handler: Callable) -> None:
+    def subscribe_all(self, handler: Callable) -> Callable:
         """
         Subscribe to all events.
         
         Args:
             handler: Async function to handle events
+            
+        Returns:
+            A subscription handle to pass to unsubscribe()
         """
         self.global_handlers.append(handler)
         logger.debug("Subscribed global handler")
+        return handler
+    
+    def unsubscribe(self, handler: Callable) -> None:
+        """
+        Remove a handler added by subscribe() or subscribe_all().
+        
+        Args:
+            handler: The handler (or handle returned by subscribe_all) to remove
+        """
+        if handler in self.global_handlers:
+            self.global_handlers.remove(handler)
+        for handlers in self.handlers.values():
+            if handler in handlers:
+                handlers.remove(handler)
+        logger.debug("Unsubscribed handler")
     
     async def start(self):
         """Start the event bus and begin processing events."""
@@ -47,6 +47,7 @@ class TaskQueue:
         self.task_handlers: Dict[str, Callable] = {}
         self.active_tasks: Set[str] = set()
         self.task_results: Dict[str, TaskResult] = {}
+        self.completion_events: Dict[str, asyncio.Event] = {}  # Set when a queued task finishes
         self._running = False
         self._processor_task: Optional[asyncio.Task] = None
         
@@ -87,7 +88,14 @@ class TaskQueue:
             correlation_id=correlation_id
         )
         
-        task_id = await self.event_bus.publish(task_event)
+        # Register before publishing: the processor may pick the task up and
+        # finish it before publish() returns
+        self.completion_events[task_event.event_id] = asyncio.Event()
+        try:
+            task_id = await self.event_bus.publish(task_event)
+        except Exception:
+            self.completion_events.pop(task_event.event_id, None)
+            raise
         logger.info(f"Queued task {task_type} with ID {task_id}")
         
         return task_id
@@ -171,6 +179,7 @@ class TaskQueue:
         
         # Mark task as active
         self.active_tasks.add(task_id)
+        self.completion_events.setdefault(task_id, asyncio.Event())
         
         try:
             # Publish task started event
@@ -234,8 +243,11 @@ class TaskQueue:
             await self._handle_task_failure(event, error_msg)
             
         finally:
-            # Remove from active tasks
+            # Remove from active tasks and wake anyone waiting on the result
             self.active_tasks.discard(task_id)
+            completion = self.completion_events.pop(task_id, None)
+            if completion:
+                completion.set()
     
     async def _handle_task_failure(self, event: Event, error: str):
         """Handle a failed task."""
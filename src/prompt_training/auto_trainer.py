@@ -50,6 +50,10 @@ class AutomaticPromptTrainer:
         self.training_history: Dict[str, List[Dict[str, Any]]] = {}
         self._running = False
         
+        # Background tasks, kept so stop() can cancel them
+        self._monitor_task: Optional[asyncio.Task] = None
+        self._training_tasks: Set[asyncio.Task] = set()
+        
     def _load_config(self, config_path: Optional[str]) -> Dict[str, Any]:
         """Load auto-training configuration"""
         if config_path and Path(config_path).exists():
@@ -92,17 +96,29 @@ class AutomaticPromptTrainer:
             logger.info("Automatic prompt training is disabled")
             return
             
+        if self._monitor_task is not None:
+            return
+            
         self._running = True
         logger.info("Starting automatic prompt trainer")
         
         # Start monitoring loop
-        asyncio.create_task(self._monitoring_loop())
+        self._monitor_task = asyncio.create_task(self._monitoring_loop())
         
     async def stop(self):
         """Stop the automatic training service"""
         self._running = False
         logger.info("Stopping automatic prompt trainer")
         
+        tasks = list(self._training_tasks)
+        if self._monitor_task is not None:
+            tasks.append(self._monitor_task)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._monitor_task = None
+        self._training_tasks.clear()
+        
     async def _monitoring_loop(self):
         """Main loop that monitors feedback and triggers training"""
         while self._running:
@@ -131,7 +147,9 @@ class AutomaticPromptTrainer:
                     self.training_queue.add(prompt_id)
                     
                     # Trigger training
-                    asyncio.create_task(self._train_prompt(prompt_id))
+                    task = asyncio.create_task(self._train_prompt(prompt_id))
+                    self._training_tasks.add(task)
+                    task.add_done_callback(self._training_tasks.discard)
                     
             except Exception as e:
                 logger.error(f"Error checking prompt {prompt_id}: {e}")
@@ -24,18 +24,26 @@ class FeedbackCollector:
         self.feedback_queue: List[Feedback] = []
         self.batch_size = 10
         self._running = False
+        self._process_task: Optional[asyncio.Task] = None
         
     async def start(self):
         """Start the feedback collection service"""
+        if self._process_task is not None:
+            return
+            
         self._running = True
         logger.info("Feedback collector started")
         
-        # Start background task for processing feedback
-        asyncio.create_task(self._process_feedback_queue())
+        # Start background task for processing feedback, kept so stop() can cancel it
+        self._process_task = asyncio.create_task(self._process_feedback_queue())
         
     async def stop(self):
         """Stop the feedback collection service"""
         self._running = False
+        if self._process_task is not None:
+            self._process_task.cancel()
+            await asyncio.gather(self._process_task, return_exceptions=True)
+            self._process_task = None
         await self._flush_queue()
         logger.info("Feedback collector stopped")
         
@@ -83,8 +91,10 @@ class FeedbackCollector:
             input_data=context.get("input", {}) if context else {},
             output_data=context.get("output", {}) if context else {},
             execution_time=context.get("execution_time") if context else None,
+            session_id=self._session_id(context),
             connector_name=context.get("connector_name") if context else None,
-            tool_name=context.get("tool_name") if context else None
+            tool_name=context.get("tool_name") if context else None,
+            cache_key=context.get("cache_key") if context else None
         )
         
         await self._add_feedback(feedback)
@@ -106,8 +116,10 @@ class FeedbackCollector:
             execution_time=execution_time,
             input_data=context.get("input", {}) if context else {},
             output_data=context.get("output", {}) if context else {},
+            session_id=self._session_id(context),
             connector_name=context.get("connector_name") if context else None,
-            tool_name=context.get("tool_name") if context else None
+            tool_name=context.get("tool_name") if context else None,
+            cache_key=context.get("cache_key") if context else None
         )
         
         await self._add_feedback(feedback)
@@ -156,6 +168,13 @@ class FeedbackCollector:
         await self._add_feedback(feedback)
         return feedback
         
+    @staticmethod
+    def _session_id(context: Optional[Dict[str, Any]]) -> Optional[str]:
+        """Get the session ID from a context, preferring its transient meta subtree"""
+        if not context:
+            return None
+        return context.get("meta", {}).get("session_id", context.get("session_id"))
+        
     async def get_feedback_for_prompt(
         self,
         prompt_id: str,
@@ -275,7 +294,8 @@ class FeedbackCollector:
             "user_id": feedback.user_id,
             "session_id": feedback.session_id,
             "connector_name": feedback.connector_name,
-            "tool_name": feedback.tool_name
+            "tool_name": feedback.tool_name,
+            "cache_key": feedback.cache_key
         }
         
     def _dict_to_feedback(self, data: Dict[str, Any]) -> Feedback:
@@ -295,5 +315,6 @@ class FeedbackCollector:
             user_id=data.get("user_id"),
             session_id=data.get("session_id"),
             connector_name=data.get("connector_name"),
-            tool_name=data.get("tool_name")
+            tool_name=data.get("tool_name"),
+            cache_key=data.get("cache_key")
         )
\ No newline at end of file
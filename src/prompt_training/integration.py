@@ -18,10 +18,34 @@ from .models import PromptType, FeedbackType
 
 logger = logging.getLogger(__name__)
 
+# Prefer orjson for parsing the config file; it expects bytes, as does json.loads
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    _json_loads = json.loads
+
+# Enum members bound once at module scope for the intercept hot paths
+_PT_CONNECTOR = PromptType.CONNECTOR
+_PT_USER = PromptType.USER
+_PT_SYSTEM = PromptType.SYSTEM
+
 
 class PromptTrainingMiddleware:
     """Middleware to integrate prompt training with MCP Gateway"""
     
+    __slots__ = (
+        "enabled",
+        "feedback_collector",
+        "prompt_manager",
+        "auto_trainer",
+        "config",
+        "session_id",
+        "_config_path",
+        "_auto_collect",
+        "_bg_tasks",
+        "_base_ctx_cache",
+    )
+    
     def __init__(self, enabled: bool = True, config_path: Optional[str] = None, openai_api_key: Optional[str] = None):
         self.enabled = enabled
         self.feedback_collector = FeedbackCollector()
@@ -35,24 +59,49 @@ class PromptTrainingMiddleware:
             config_path=config_path
         )
         
-        # Load configuration
-        self.config = self._load_config(config_path)
+        # Configuration defaults until start() loads the config file
+        self._config_path = config_path
+        self.config = self._default_config()
+        self._auto_collect = self.config.get("auto_collect", True)
         
         # Session tracking
         self.session_id = str(datetime.now().timestamp())
         
-        # Start services
+        # In-flight feedback collection tasks, kept so they are not garbage collected
+        self._bg_tasks: set = set()
+        
+        # Stable per-(connector, prompt) feedback context, copied per call
+        self._base_ctx_cache: Dict[tuple, Dict[str, Any]] = {}
+        
+    async def start(self):
+        """Start the feedback collector and automatic trainer.
+        
+        Must be called once from a running event loop (e.g. the connector's
+        initialize hook). The collector and trainer keep their own loop tasks
+        and cancel them in stop(), which shutdown() calls.
+        """
+        self.config = await self._load_config_async(self._config_path)
+        self._auto_collect = self.config.get("auto_collect", True)
+        
         if self.enabled:
-            asyncio.create_task(self.feedback_collector.start())
-            asyncio.create_task(self.auto_trainer.start())
+            await self.feedback_collector.start()
+            await self.auto_trainer.start()
             
-    def _load_config(self, config_path: Optional[str]) -> Dict[str, Any]:
+    async def _load_config_async(self, config_path: Optional[str]) -> Dict[str, Any]:
+        """Load training configuration without blocking the event loop"""
+        return await asyncio.to_thread(self._sync_load_config, config_path)
+        
+    def _sync_load_config(self, config_path: Optional[str]) -> Dict[str, Any]:
         """Load training configuration"""
         if config_path and Path(config_path).exists():
-            with open(config_path, 'r') as f:
-                return json.load(f)
+            with open(config_path, 'rb') as f:
+                return _json_loads(f.read())
                 
-        # Default configuration
+        return self._default_config()
+        
+    @staticmethod
+    def _default_config() -> Dict[str, Any]:
+        """Default training configuration"""
         return {
             "auto_collect": True,
             "collect_errors": True,
@@ -61,6 +110,11 @@ class PromptTrainingMiddleware:
             "prompt_improvement_enabled": True
         }
         
+    @property
+    def active(self) -> bool:
+        """Whether the middleware collects anything at all"""
+        return self.enabled and self._auto_collect
+        
     async def intercept_prompt_execution(
         self,
         connector: BaseConnector,
@@ -69,13 +123,13 @@ class PromptTrainingMiddleware:
         execute_fn
     ) -> PromptResult:
         """Intercept prompt execution for training data collection"""
-        if not self.enabled or not self.config.get("auto_collect", True):
+        if not self.active:
             # Pass through without collection
             return await execute_fn(prompt_name, arguments)
             
-        # Generate prompt ID
-        prompt_id = f"{connector.name}_{prompt_name}"
-        prompt_type = PromptType.CONNECTOR
+        base_ctx = self._base_context(connector.name, prompt_name)
+        prompt_id = base_ctx["cache_key"]
+        prompt_type = _PT_CONNECTOR
         
         # Check if we have an improved version
         improved_prompt = None
@@ -103,18 +157,15 @@ class PromptTrainingMiddleware:
             
             # Collect success feedback if execution was significant
             if self.config.get("collect_success", True) and execution_time > self.config.get("min_execution_time", 0.1):
-                await self.feedback_collector.collect_success(
+                context = base_ctx.copy()
+                context["input"] = arguments
+                context["output"] = {"content": result.content, "metadata": result.metadata}
+                self._spawn(self.feedback_collector.collect_success(
                     prompt_id=prompt_id,
                     prompt_type=prompt_type,
                     execution_time=execution_time,
-                    context={
-                        "connector_name": connector.name,
-                        "prompt_name": prompt_name,
-                        "input": arguments,
-                        "output": {"content": result.content, "metadata": result.metadata},
-                        "session_id": self.session_id
-                    }
-                )
+                    context=context
+                ))
                 
             return result
             
@@ -128,21 +179,48 @@ class PromptTrainingMiddleware:
             
             # Collect error feedback
             if self.config.get("collect_errors", True):
-                await self.feedback_collector.collect_error(
+                context = base_ctx.copy()
+                context["input"] = arguments
+                self._spawn(self.feedback_collector.collect_error(
                     prompt_id=prompt_id,
                     prompt_type=prompt_type,
                     error_details=error_details,
-                    context={
-                        "connector_name": connector.name,
-                        "prompt_name": prompt_name,
-                        "input": arguments,
-                        "session_id": self.session_id
-                    }
-                )
+                    context=context
+                ))
                 
             # Re-raise the exception
             raise
             
+    def _base_context(self, connector_name: str, prompt_name: str) -> Dict[str, Any]:
+        """Get the cached feedback context shared by all calls of a prompt.
+        
+        Callers must copy it before adding per-call fields; the nested meta
+        dict is shared and must not be mutated.
+        """
+        key = (connector_name, prompt_name)
+        base_ctx = self._base_ctx_cache.get(key)
+        if base_ctx is None:
+            base_ctx = self._base_ctx_cache[key] = {
+                "cache_key": f"{connector_name}_{prompt_name}",
+                "connector_name": connector_name,
+                "prompt_name": prompt_name,
+                "meta": {"session_id": self.session_id}
+            }
+        return base_ctx
+        
+    def _spawn(self, coro) -> asyncio.Task:
+        """Run feedback collection in the background, off the response path"""
+        task = asyncio.create_task(coro)
+        self._bg_tasks.add(task)
+        task.add_done_callback(self._on_bg_task_done)
+        return task
+        
+    def _on_bg_task_done(self, task: asyncio.Task):
+        """Forget a finished collection task and log its failure, if any"""
+        self._bg_tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error(f"Error collecting feedback: {task.exception()}")
+            
     async def intercept_tool_execution(
         self,
         connector: BaseConnector,
@@ -151,7 +229,7 @@ class PromptTrainingMiddleware:
         execute_fn
     ) -> ToolResponse:
         """Intercept tool execution for training data collection"""
-        if not self.enabled or not self.config.get("auto_collect", True):
+        if not self.active:
             return await execute_fn(tool_name, arguments)
             
         # For tools, we primarily collect error data
@@ -174,7 +252,7 @@ class PromptTrainingMiddleware:
                 # Store as automated metric
                 await self.feedback_collector.collect_automated_metric(
                     prompt_id=f"{connector.name}_tools",
-                    prompt_type=PromptType.CONNECTOR,
+                    prompt_type=_PT_CONNECTOR,
                     metric_name="tool_error_rate",
                     metric_value=0.0,  # Error = 0 success
                     context={
@@ -195,7 +273,7 @@ class PromptTrainingMiddleware:
         context: Optional[Dict[str, Any]] = None
     ):
         """Manually collect user feedback"""
-        prompt_type = PromptType.USER if not prompt_id.startswith("system_") else PromptType.SYSTEM
+        prompt_type = _PT_USER if not prompt_id.startswith("system_") else _PT_SYSTEM
         
         await self.feedback_collector.collect_user_feedback(
             prompt_id=prompt_id,
@@ -215,7 +293,7 @@ class PromptTrainingMiddleware:
         context: Optional[Dict[str, Any]] = None
     ):
         """Collect improvement suggestion"""
-        prompt_type = PromptType.USER if not prompt_id.startswith("system_") else PromptType.SYSTEM
+        prompt_type = _PT_USER if not prompt_id.startswith("system_") else _PT_SYSTEM
         
         await self.feedback_collector.collect_improvement_suggestion(
             prompt_id=prompt_id,
@@ -239,6 +317,9 @@ class PromptTrainingMiddleware:
         
     async def shutdown(self):
         """Shutdown the training middleware"""
+        # Let in-flight feedback land before the collector flushes
+        await asyncio.gather(*self._bg_tasks, return_exceptions=True)
+        
         if self.enabled:
             await self.feedback_collector.stop()
             await self.auto_trainer.stop()
@@ -254,6 +335,16 @@ class PromptTrainingConnector(BaseConnector):
             config_path=config.get("config_path")
         )
         
+    async def initialize(self) -> None:
+        """Start the training middleware services"""
+        await self.middleware.start()
+        await super().initialize()
+        
+    async def shutdown(self) -> None:
+        """Stop the training middleware services"""
+        await self.middleware.shutdown()
+        await super().shutdown()
+        
     def get_tools(self):
         """Provide user-facing training tools"""
         from core.models import ToolDefinition
@@ -49,6 +49,10 @@ class Feedback:
     session_id: Optional[str] = None
     connector_name: Optional[str] = None
     tool_name: Optional[str] = None
+    
+    # Stable, session-independent key (e.g. for an LLM provider's
+    # prompt_cache_key); never derive it from per-session data
+    cache_key: Optional[str] = None
 
 
 @dataclass
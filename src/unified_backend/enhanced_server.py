@@ -445,6 +445,10 @@ class EnhancedUnifiedServer:
         
         return Response(text=html, content_type='text/html')
     
+    def store_oauth_callback(self, callback_id: str, data: Dict[str, Any]):
+        """Add a pending OAuth callback"""
+        self.oauth_callbacks[callback_id] = data
+    
     def _determine_oauth_service(self, request: Request) -> str:
         """Determine which service the OAuth callback is for"""
         # Check state parameter
@@ -10,7 +10,7 @@ import signal
 import sys
 from typing import Optional
 
-from src.unified_backend.server import UnifiedServer
+from src.unified_backend.server import UnifiedServer, install_uvloop
 from src.unified_backend.oauth_integration import initialize_oauth_manager
 from src.core.registry import ConnectorRegistry
 from src.core.config import ConfigManager
@@ -180,10 +180,18 @@ async def run_backend_only():
     print(f"  WebSocket: ws://localhost:{server.port}/ws")
     print(f"\nPress Ctrl+C to stop\n")
     
+    stop_event = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, stop_event.set)
+        except NotImplementedError:
+            # Windows: Ctrl+C still interrupts asyncio.run, which cancels us
+            pass
+    
     try:
-        while True:
-            await asyncio.sleep(1)
-    except KeyboardInterrupt:
+        # Keep server running; the loop stays idle until a shutdown signal
+        await stop_event.wait()
         print("\nShutting down...")
     finally:
         await server.stop()
@@ -223,6 +231,9 @@ def main():
     logging.getLogger("aiohttp").setLevel(logging.WARNING)
     logging.getLogger("asyncio").setLevel(logging.WARNING)
     
+    # Use uvloop when the 'fast' extra is installed
+    install_uvloop()
+    
     # Run based on mode
     if args.mode == "unified":
         asyncio.run(run_unified_mode())
@@ -308,12 +308,12 @@ class MCPIntegration:
             
             # Store in unified backend's OAuth callbacks
             callback_id = f"mcp_{state}"
-            self.server.oauth_callbacks[callback_id] = {
+            self.server.store_oauth_callback(callback_id, {
                 'service': 'claude_ai',
                 'code': code,
                 'state': state,
                 'timestamp': datetime.now().isoformat()
-            }
+            })
             
             # TODO: Exchange code for token with Claude.AI
             
@@ -4,19 +4,24 @@ Consolidates OAuth callbacks, Chrome extension API, and other HTTP services
 """
 
 import asyncio
+import html
 import socket
+import sys
 import logging
 import json
 import time
 from datetime import datetime
-from typing import Dict, Any, Optional, List, Callable
+from typing import Dict, Any, Optional, List, Set, Callable
 from urllib.parse import urlparse, parse_qs
-import uuid
+import secrets
+import importlib.util
+from collections import OrderedDict, defaultdict, deque
+from dataclasses import dataclass, field, fields
 
 from aiohttp import web
-from aiohttp.web import Request, Response, json_response
-import aiohttp_cors
+from aiohttp.web import Request, Response
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo.errors import BulkWriteError, WriteError
 
 # Import event system components
 try:
@@ -26,8 +31,258 @@ except ImportError:
     event_system_available = False
     EventSystemManager = None
 
+# orjson is an optional, faster JSON encoder
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
+# MongoDB wire compressors to request, limited to those whose library is
+# installed (pymongo would warn about and drop the others)
+_MONGO_COMPRESSORS = [
+    name for name, module in (('zstd', 'zstandard'), ('snappy', 'snappy'))
+    if importlib.util.find_spec(module) is not None
+]
+
+
+# OAuth callback pages; only the error text varies
+_OAUTH_SUCCESS_HTML = """
+            <html>
+            <head><title>Authorization Successful</title></head>
+            <body style="font-family: Arial; padding: 40px; text-align: center;">
+                <h2>✅ Authorization Successful!</h2>
+                <p>You can now close this window and return to the application.</p>
+                <script>
+                    // Auto-close after 3 seconds
+                    setTimeout(() => window.close(), 3000);
+                </script>
+            </body>
+            </html>
+            """.encode()
+
+_OAUTH_ERROR_HTML = """
+            <html>
+            <head><title>Authorization Failed</title></head>
+            <body style="font-family: Arial; padding: 40px; text-align: center;">
+                <h2>❌ Authorization Failed</h2>
+                <p>Error: {error}</p>
+                <p>You can close this window and try again.</p>
+            </body>
+            </html>
+            """
+
+
+# OAuth service detection, checked in order against the lowercased state
+# parameter and then the Referer header
+_STATE_SERVICE_KEYWORDS = (
+    ('gmail', 'gmail'),
+    ('gcal', 'gcal'),
+    ('calendar', 'gcal'),
+    ('github', 'github'),
+    ('slack', 'slack'),
+)
+_REFERRER_SERVICE_KEYWORDS = (
+    ('google', 'google'),
+    ('github', 'github'),
+    ('slack', 'slack'),
+)
+
+# Response headers a browser always exposes, so they are not listed in
+# Access-Control-Expose-Headers
+_SIMPLE_RESPONSE_HEADERS = frozenset(
+    h.upper() for h in (
+        'Cache-Control', 'Content-Language', 'Content-Type',
+        'Expires', 'Last-Modified', 'Pragma',
+    )
+)
+
+
+def install_uvloop() -> bool:
+    """Use uvloop for new event loops if it is installed.
+    
+    Call before asyncio.run(); loops that already exist are unaffected.
+    Install the 'fast' extra to get uvloop (not available on Windows).
+    """
+    if sys.platform == 'win32':
+        return False
+    try:
+        import uvloop
+    except ImportError:
+        return False
+        
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    logger.debug("Using uvloop event loop policy")
+    return True
+
+
+def _is_preflight(request: Request) -> bool:
+    """Whether a request is a CORS preflight request"""
+    return (
+        request.method == 'OPTIONS'
+        and 'Origin' in request.headers
+        and 'Access-Control-Request-Method' in request.headers
+    )
+
+
+@web.middleware
+async def _cors_preflight_middleware(request: Request, handler):
+    """Answer CORS preflight requests for every route.
+    
+    Unlike aiohttp_cors, this runs before routing, so a preflight for an
+    unknown path also gets a 200, and it allows exactly the method asked
+    for rather than listing every method of the route.
+    """
+    if not _is_preflight(request):
+        return await handler(request)
+        
+    headers = {
+        'Access-Control-Allow-Origin': request.headers['Origin'],
+        'Access-Control-Allow-Credentials': 'true',
+        'Access-Control-Allow-Methods': request.headers['Access-Control-Request-Method'],
+    }
+    requested_headers = request.headers.get('Access-Control-Request-Headers')
+    if requested_headers:
+        headers['Access-Control-Allow-Headers'] = requested_headers
+    return Response(headers=headers)
+
+
+async def _add_cors_headers(request: Request, response: web.StreamResponse):
+    """Add CORS headers to non-preflight responses from a browser origin"""
+    origin = request.headers.get('Origin')
+    if origin is None or _is_preflight(request):
+        return
+        
+    exposed = [h for h in response.headers.keys() if h.upper() not in _SIMPLE_RESPONSE_HEADERS]
+    response.headers['Access-Control-Expose-Headers'] = ','.join(exposed)
+    response.headers['Access-Control-Allow-Origin'] = origin
+    response.headers['Access-Control-Allow-Credentials'] = 'true'
+
+
+def _json_default(obj: Any) -> Any:
+    """Serialize the types orjson handles natively when falling back to json"""
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    raise TypeError(f'Object of type {type(obj).__name__} is not JSON serializable')
+
+
+def _dumps(obj: Any) -> bytes:
+    """Serialize an object to compact UTF-8 JSON, using orjson when available"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, separators=(',', ':'), default=_json_default).encode()
+
+
+_loads = orjson.loads if orjson is not None else json.loads
+
+
+def _json_response(data: Any, **kwargs) -> Response:
+    """Build a JSON response with the fastest available encoder"""
+    return Response(body=_dumps(data), content_type='application/json', **kwargs)
+
+
+async def _read_json(request: Request) -> Any:
+    """Parse a JSON request body with the fastest available decoder"""
+    return _loads(await request.read())
+
+
+# aiohttp >= 3.11 can write a pre-encoded buffer as a TEXT frame without
+# the str round trip that send_str requires
+_HAS_SEND_FRAME = hasattr(web.WebSocketResponse, 'send_frame')
+
+
+def _encoded_sender(payload: bytes) -> Callable[[web.WebSocketResponse], Any]:
+    """Build a function sending pre-encoded JSON to a WebSocket as a TEXT frame.
+    
+    Without send_frame the payload is decoded here, once, however many
+    sockets it goes to.
+    """
+    if _HAS_SEND_FRAME:
+        return lambda ws: ws.send_frame(payload, web.WSMsgType.TEXT)
+    text = payload.decode()
+    return lambda ws: ws.send_str(text)
+
+
+def _send_encoded(ws: web.WebSocketResponse, payload: bytes):
+    """Send pre-encoded JSON to a WebSocket as a TEXT frame"""
+    return _encoded_sender(payload)(ws)
+
+
+# Most queued events sent in a single /ws/events frame
+_EVENT_WS_MAX_BATCH = 128
+
+# How long an unclaimed OAuth callback is kept, and how many are kept at most
+_OAUTH_CALLBACK_TTL = 600.0
+_OAUTH_CALLBACK_MAX = 1024
+
+# Largest page /api/events/recent will return
+_RECENT_EVENTS_MAX_LIMIT = 1000
+
+# Longest a task status request may long-poll with ?wait=
+_TASK_STATUS_MAX_WAIT = 60.0
+
+# Clients served between event loop yields when fanning out a message
+_FAN_OUT_BATCH = 50
+
+# Events buffered per /ws/events client before the oldest are dropped
+_EVENT_WS_QUEUE_SIZE = 1024
+
+
+# Constant until the MCP Bridge status is actually checked
+_MCP_STATUS_BODY = _dumps({
+    'connected': False,
+    'message': 'MCP Bridge integration pending'
+})
+
+
+@dataclass(slots=True)
+class PluginRecord:
+    """A registered plugin, with its JSON encoding cached until it changes"""
+    id: str
+    name: str
+    type: str
+    capabilities: List[Any]
+    registered_at: str
+    status: str = 'active'
+    version: Optional[str] = None
+    extra: Dict[str, Any] = field(default_factory=dict)
+    _json: Optional[bytes] = field(default=None, repr=False, compare=False)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain dict in the wire format clients already consume"""
+        data = {'id': self.id, 'name': self.name, 'type': self.type}
+        if self.version is not None:
+            data['version'] = self.version
+        data['capabilities'] = self.capabilities
+        data['registered_at'] = self.registered_at
+        data['status'] = self.status
+        data.update(self.extra)
+        return data
+    
+    def json_bytes(self) -> bytes:
+        """Encoded record, re-encoded only after a mutation"""
+        if self._json is None:
+            self._json = _dumps(self.to_dict())
+        return self._json
+    
+    def set_status(self, status: str):
+        """Change the status and invalidate the cached encoding"""
+        self.status = status
+        self._json = None
+    
+    def update(self, changes: Dict[str, Any]):
+        """Merge a status update sent by the plugin"""
+        for key, value in changes.items():
+            if key in _PLUGIN_RECORD_FIELDS:
+                setattr(self, key, value)
+            else:
+                self.extra[key] = value
+        self._json = None
+
+
+_PLUGIN_RECORD_FIELDS = frozenset(f.name for f in fields(PluginRecord)) - {'extra', '_json'}
+
 
 class UnifiedServer:
     """
@@ -45,73 +300,126 @@ class UnifiedServer:
         self.runner = None
         self.site = None
         self.base_url = None
+        self._last_port: Optional[int] = None
         
-        # Store for OAuth callbacks waiting to be processed
-        self.oauth_callbacks: Dict[str, Dict[str, Any]] = {}
+        # Coarse wall clock for response timestamps, refreshed once per second
+        self._now_iso = datetime.now().isoformat()
+        self._clock_task: Optional[asyncio.Task] = None
+        
+        # Store for OAuth callbacks waiting to be processed, oldest first.
+        # Entries expire after _OAUTH_CALLBACK_TTL and the store is capped at
+        # _OAUTH_CALLBACK_MAX so abandoned flows can't accumulate. Add entries
+        # with store_oauth_callback() so the deadlines and index stay in step.
+        self.oauth_callbacks: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._oauth_deadlines: Dict[str, float] = {}
+        self._oauth_by_service: Dict[str, Dict[str, None]] = defaultdict(dict)  # Keys keep arrival order
         
         # Store for WebSocket connections
-        self.websockets: List[web.WebSocketResponse] = []
+        self.websockets: Set[web.WebSocketResponse] = set()
+        
+        # References to fire-and-forget broadcasts so they aren't collected mid-flight
+        self._bg_tasks: Set[asyncio.Task] = set()
         
         # Store for debugging
-        self.request_log: List[Dict[str, Any]] = []
         self.max_log_size = 100
+        self.request_log: deque = deque(maxlen=self.max_log_size)
+        self.enable_request_log = logger.isEnabledFor(logging.DEBUG)
         
         # Plugin management
-        self.registered_plugins: Dict[str, Dict[str, Any]] = {}
+        self.registered_plugins: Dict[str, PluginRecord] = {}
         self.plugin_connections: Dict[str, web.WebSocketResponse] = {}
         
         # OAuth handlers by service
         self.oauth_handlers: Dict[str, Callable] = {}
         
+        # Dispatch tables for extension actions and plugin websocket messages
+        self._extension_actions: Dict[str, Callable] = {
+            'get_oauth_status': self._ext_oauth_status,
+        }
+        self._plugin_message_handlers: Dict[str, Callable] = {
+            'status_update': self._plugin_status_update,
+            'action_result': self._plugin_action_result,
+        }
+        
         # Event system integration
         self.enable_events = enable_events and event_system_available
         self.mongo_uri = mongo_uri
         self.event_system: Optional[EventSystemManager] = None
         self.mongo_client: Optional[AsyncIOMotorClient] = None
         
+        # Published events are coalesced into one insert per batch window
+        self._event_batch: List[tuple] = []
+        self._event_batch_window = 0.002
+        self._event_flush_task: Optional[asyncio.Task] = None
+        
+        # /ws/events clients and their queues of encoded events, fed by a
+        # single shared event bus subscription
+        self._ws_clients: Dict[web.WebSocketResponse, asyncio.Queue] = {}
+        self._event_subscription: Optional[Callable] = None
+        
+        # Events discarded because a /ws/events client fell too far behind
+        self._ws_events_dropped = 0
+        
     def find_available_port(self) -> Optional[int]:
         """Find an available port in the specified range"""
-        for port in range(self.port_range[0], self.port_range[1] + 1):
-            try:
-                # Try to bind to the port
-                sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-                sock.bind(('', port))
-                sock.close()
+        ports = list(range(self.port_range[0], self.port_range[1] + 1))
+        
+        # Try the port that worked last time first
+        if self._last_port in ports:
+            ports.remove(self._last_port)
+            ports.insert(0, self._last_port)
+            
+        for port in ports:
+            if self._port_is_free(port):
+                self._last_port = port
                 return port
-            except OSError:
-                continue
         return None
     
+    @staticmethod
+    def _port_is_free(port: int) -> bool:
+        """Whether every address the site binds ('localhost') is free on this port"""
+        try:
+            addresses = socket.getaddrinfo('localhost', port, type=socket.SOCK_STREAM)
+        except socket.gaierror:
+            return False
+            
+        for family, sock_type, proto, _, address in addresses:
+            sock = socket.socket(family, sock_type, proto)
+            try:
+                # No SO_REUSEADDR: on macOS/BSD and Windows it lets the probe
+                # succeed on a port another process is listening on
+                if sys.platform == 'win32':
+                    sock.setsockopt(socket.SOL_SOCKET, socket.SO_EXCLUSIVEADDRUSE, 1)
+                sock.bind(address)
+            except OSError:
+                return False
+            finally:
+                sock.close()
+        return True
+    
     def log_request(self, request: Request, response_data: Any = None):
         """Log request for debugging"""
+        if not self.enable_request_log:
+            return
+            
+        # Headers and query are read-only views; /debug copies them to dicts
         log_entry = {
             'timestamp': datetime.now().isoformat(),
             'method': request.method,
             'path': request.path,
-            'headers': dict(request.headers),
-            'query': dict(request.query),
+            'headers': request.headers,
+            'query': request.query,
             'response': response_data
         }
         
+        # The deque evicts the oldest entry once max_log_size is reached
         self.request_log.append(log_entry)
-        
-        # Keep log size limited
-        if len(self.request_log) > self.max_log_size:
-            self.request_log = self.request_log[-self.max_log_size:]
     
     async def create_app(self) -> web.Application:
         """Create the aiohttp application with all routes"""
-        self.app = web.Application()
-        
-        # Set up CORS
-        cors = aiohttp_cors.setup(self.app, defaults={
-            "*": aiohttp_cors.ResourceOptions(
-                allow_credentials=True,
-                expose_headers="*",
-                allow_headers="*",
-                allow_methods="*"
-            )
-        })
+        # CORS: allow any origin with credentials, all methods and headers
+        self.app = web.Application(middlewares=[_cors_preflight_middleware])
+        self.app.on_response_prepare.append(_add_cors_headers)
         
         # Add routes
         routes = [
@@ -167,8 +475,11 @@ class UnifiedServer:
             ]
             routes.extend(event_routes)
         
-        for route in routes:
-            cors.add(self.app.router.add_route(route.method, route.path, route.handler))
+        self.app.router.add_routes(routes)
+        
+        self.app.on_startup.append(self._start_clock)
+        self.app.on_cleanup.append(self._stop_clock)
+        self.app.on_cleanup.append(self._drain_broadcasts)
         
         # Initialize event system if enabled
         if self.enable_events:
@@ -177,6 +488,23 @@ class UnifiedServer:
         
         return self.app
     
+    async def _start_clock(self, app):
+        """Start refreshing the cached response timestamp"""
+        self._clock_task = asyncio.create_task(self._tick())
+        
+    async def _stop_clock(self, app):
+        """Stop refreshing the cached response timestamp"""
+        if self._clock_task:
+            self._clock_task.cancel()
+            await asyncio.gather(self._clock_task, return_exceptions=True)
+            self._clock_task = None
+            
+    async def _tick(self):
+        """Update the cached ISO timestamp once per second"""
+        while True:
+            self._now_iso = datetime.now().isoformat()
+            await asyncio.sleep(1)
+    
     # Root and health endpoints
     async def handle_root(self, request: Request) -> Response:
         """Root endpoint with service information"""
@@ -194,7 +522,7 @@ class UnifiedServer:
                 'plugin_api': f'{self.base_url}/api/plugins/',
                 'websocket': f'ws://localhost:{self.port}/ws'
             },
-            'timestamp': datetime.now().isoformat()
+            'timestamp': self._now_iso
         }
         
         # Add event system endpoints if enabled
@@ -207,30 +535,36 @@ class UnifiedServer:
                 'status': 'active' if self.event_system else 'initializing'
             }
         
-        return json_response(data)
+        return _json_response(data)
     
     async def handle_health(self, request: Request) -> Response:
         """Health check endpoint"""
-        return json_response({
-            'status': 'healthy',
-            'port': self.port,
-            'active_websockets': len(self.websockets),
-            'pending_oauth': len(self.oauth_callbacks),
-            'registered_plugins': len(self.registered_plugins),
-            'connected_plugins': sum(1 for ws in self.plugin_connections.values() if not ws.closed),
-            'timestamp': datetime.now().isoformat()
-        })
+        # Assembled directly: every value is a number, null or a plain ISO timestamp
+        self._expire_oauth_callbacks()
+        body = (
+            f'{{"status":"healthy","port":{"null" if self.port is None else int(self.port)},'
+            f'"active_websockets":{len(self.websockets)},'
+            f'"pending_oauth":{len(self.oauth_callbacks)},'
+            f'"registered_plugins":{len(self.registered_plugins)},'
+            f'"connected_plugins":{len(self.plugin_connections)},'
+            f'"timestamp":"{self._now_iso}"}}'
+        )
+        return Response(body=body.encode(), content_type='application/json')
     
     async def handle_debug(self, request: Request) -> Response:
         """Debug information endpoint"""
-        return json_response({
+        self._expire_oauth_callbacks()
+        return _json_response({
             'port': self.port,
             'active_websockets': len(self.websockets),
             'pending_oauth_callbacks': list(self.oauth_callbacks.keys()),
             'registered_plugins': list(self.registered_plugins.keys()),
             'connected_plugins': [pid for pid, ws in self.plugin_connections.items() if not ws.closed],
-            'recent_requests': self.request_log[-20:],
-            'timestamp': datetime.now().isoformat()
+            'recent_requests': [
+                {**entry, 'headers': dict(entry['headers']), 'query': dict(entry['query'])}
+                for entry in list(self.request_log)[-20:]
+            ],
+            'timestamp': self._now_iso
         })
     
     # OAuth endpoints
@@ -247,52 +581,33 @@ class UnifiedServer:
         service = self._determine_oauth_service(request)
         
         # Store callback data
-        callback_id = str(uuid.uuid4())
-        self.oauth_callbacks[callback_id] = {
+        callback_id = secrets.token_hex(16)
+        self.store_oauth_callback(callback_id, {
             'service': service,
             'code': code,
             'state': state,
             'error': error,
             'timestamp': datetime.now().isoformat(),
             'query': dict(request.query)
-        }
+        })
         
         # Notify via WebSocket if any clients connected
-        await self._broadcast_websocket({
-            'type': 'oauth_callback',
-            'callback_id': callback_id,
-            'service': service,
-            'success': code is not None
-        })
+        if self._has_listeners():
+            self._broadcast_soon({
+                'type': 'oauth_callback',
+                'callback_id': callback_id,
+                'service': service,
+                'success': code is not None
+            })
         
         # Return user-friendly HTML response
         if error:
-            html = f"""
-            <html>
-            <head><title>Authorization Failed</title></head>
-            <body style="font-family: Arial; padding: 40px; text-align: center;">
-                <h2>❌ Authorization Failed</h2>
-                <p>Error: {error}</p>
-                <p>You can close this window and try again.</p>
-            </body>
-            </html>
-            """
-        else:
-            html = f"""
-            <html>
-            <head><title>Authorization Successful</title></head>
-            <body style="font-family: Arial; padding: 40px; text-align: center;">
-                <h2>✅ Authorization Successful!</h2>
-                <p>You can now close this window and return to the application.</p>
-                <script>
-                    // Auto-close after 3 seconds
-                    setTimeout(() => window.close(), 3000);
-                </script>
-            </body>
-            </html>
-            """
+            return Response(
+                text=_OAUTH_ERROR_HTML.format(error=html.escape(error)),
+                content_type='text/html'
+            )
         
-        return Response(text=html, content_type='text/html')
+        return Response(body=_OAUTH_SUCCESS_HTML, content_type='text/html', charset='utf-8')
     
     async def handle_service_oauth_callback(self, request: Request) -> Response:
         """Service-specific OAuth callback handler"""
@@ -308,24 +623,16 @@ class UnifiedServer:
     def _determine_oauth_service(self, request: Request) -> str:
         """Determine which service the OAuth callback is for"""
         # Check state parameter
-        state = request.query.get('state', '')
-        if 'gmail' in state.lower():
-            return 'gmail'
-        elif 'gcal' in state.lower() or 'calendar' in state.lower():
-            return 'gcal'
-        elif 'github' in state.lower():
-            return 'github'
-        elif 'slack' in state.lower():
-            return 'slack'
+        state = request.query.get('state', '').lower()
+        for keyword, service in _STATE_SERVICE_KEYWORDS:
+            if keyword in state:
+                return service
         
         # Check referrer
         referrer = request.headers.get('Referer', '')
-        if 'google' in referrer:
-            return 'google'
-        elif 'github' in referrer:
-            return 'github'
-        elif 'slack' in referrer:
-            return 'slack'
+        for keyword, service in _REFERRER_SERVICE_KEYWORDS:
+            if keyword in referrer:
+                return service
         
         return 'unknown'
     
@@ -334,29 +641,29 @@ class UnifiedServer:
         """Extension connectivity test"""
         self.log_request(request)
         
-        data = await request.json()
+        data = await _read_json(request)
         extension_id = data.get('extensionId')
         capabilities = data.get('capabilities', [])
         
         # Register extension if it has capabilities
         if extension_id and capabilities:
-            self.registered_plugins[f"extension_{extension_id}"] = {
-                'id': extension_id,
-                'name': 'Chrome Extension',
-                'type': 'chrome_extension',
-                'capabilities': capabilities,
-                'registered_at': datetime.now().isoformat(),
-                'status': 'active'
-            }
+            self.registered_plugins[f"extension_{extension_id}"] = PluginRecord(
+                id=extension_id,
+                name='Chrome Extension',
+                type='chrome_extension',
+                capabilities=capabilities,
+                registered_at=datetime.now().isoformat()
+            )
             
             # Broadcast extension activation
-            await self._broadcast_websocket({
-                'type': 'extension_activated',
-                'extension_id': extension_id,
-                'capabilities': capabilities
-            })
+            if self._has_listeners():
+                self._broadcast_soon({
+                    'type': 'extension_activated',
+                    'extension_id': extension_id,
+                    'capabilities': capabilities
+                })
         
-        return json_response({
+        return _json_response({
             'status': 'ok',
             'message': 'Unified backend is running',
             'port': self.port,
@@ -366,17 +673,18 @@ class UnifiedServer:
     
     async def handle_page_context(self, request: Request) -> Response:
         """Receive page context from extension"""
-        data = await request.json()
+        data = await _read_json(request)
         self.log_request(request, data)
         
         # Broadcast to WebSocket clients
-        await self._broadcast_websocket({
-            'type': 'page_context',
-            'data': data,
-            'timestamp': datetime.now().isoformat()
-        })
+        if self._has_listeners():
+            self._broadcast_soon({
+                'type': 'page_context',
+                'data': data,
+                'timestamp': self._now_iso
+            })
         
-        return json_response({
+        return _json_response({
             'success': True,
             'data': {
                 'message': f"Received context for {data.get('title', 'unknown')}",
@@ -387,26 +695,30 @@ class UnifiedServer:
     
     async def handle_extension_request(self, request: Request) -> Response:
         """Handle generic extension requests"""
-        data = await request.json()
+        data = await _read_json(request)
         self.log_request(request, data)
         
-        action = data.get('action')
-        
         # Route to appropriate handler
-        if action == 'get_oauth_status':
-            return json_response({
-                'success': True,
-                'data': {
-                    'pending_callbacks': len(self.oauth_callbacks),
-                    'services': list(self.oauth_callbacks.keys())
-                }
-            })
-        
-        # Default response
-        return json_response({
+        handler = self._extension_actions.get(data.get('action'), self._ext_default)
+        return await handler(data)
+    
+    async def _ext_oauth_status(self, data: Dict[str, Any]) -> Response:
+        """Extension action: report pending OAuth callbacks"""
+        self._expire_oauth_callbacks()
+        return _json_response({
             'success': True,
             'data': {
-                'action': action,
+                'pending_callbacks': len(self.oauth_callbacks),
+                'services': list(self.oauth_callbacks.keys())
+            }
+        })
+    
+    async def _ext_default(self, data: Dict[str, Any]) -> Response:
+        """Default extension action: echo the request"""
+        return _json_response({
+            'success': True,
+            'data': {
+                'action': data.get('action'),
                 'echo': data.get('data', {}),
                 'processed': True
             }
@@ -418,7 +730,7 @@ class UnifiedServer:
         ws = web.WebSocketResponse()
         await ws.prepare(request)
         
-        self.websockets.append(ws)
+        self.websockets.add(ws)
         logger.info(f"WebSocket connected. Total: {len(self.websockets)}")
         
         # Send welcome message
@@ -426,13 +738,13 @@ class UnifiedServer:
             'type': 'connected',
             'message': 'Connected to Unified Backend',
             'port': self.port,
-            'timestamp': datetime.now().isoformat()
+            'timestamp': self._now_iso
         })
         
         try:
             async for msg in ws:
-                if msg.type == web.WSMsgType.TEXT:
-                    data = json.loads(msg.data)
+                if msg.type is web.WSMsgType.TEXT:
+                    data = msg.json(loads=_loads)
                     logger.info(f"WebSocket received: {data.get('type', 'unknown')}")
                     
                     # Echo back with processing info
@@ -440,44 +752,67 @@ class UnifiedServer:
                         'type': 'response',
                         'original': data,
                         'processed': True,
-                        'timestamp': datetime.now().isoformat()
+                        'timestamp': self._now_iso
                     })
                     
-                elif msg.type == web.WSMsgType.ERROR:
+                elif msg.type is web.WSMsgType.ERROR:
                     logger.error(f'WebSocket error: {ws.exception()}')
                     
         except Exception as e:
             logger.error(f"WebSocket error: {e}")
         finally:
-            self.websockets.remove(ws)
+            self.websockets.discard(ws)
             logger.info(f"WebSocket disconnected. Total: {len(self.websockets)}")
             
         return ws
     
+    def _has_listeners(self) -> bool:
+        """Whether any WebSocket client would receive a broadcast"""
+        return bool(self.websockets)
+    
+    def _broadcast_soon(self, message: Dict[str, Any]):
+        """Broadcast in the background so the HTTP response isn't held up"""
+        task = asyncio.create_task(self._broadcast_websocket(message))
+        self._bg_tasks.add(task)
+        task.add_done_callback(self._bg_tasks.discard)
+    
+    async def _drain_broadcasts(self, app):
+        """Let in-flight background broadcasts finish on shutdown"""
+        if self._bg_tasks:
+            await asyncio.gather(*self._bg_tasks, return_exceptions=True)
+    
     async def _broadcast_websocket(self, message: Dict[str, Any]):
         """Broadcast message to all connected WebSocket clients"""
         if not self.websockets:
             return
             
-        disconnected = []
-        for ws in self.websockets:
-            try:
-                await ws.send_json(message)
-            except ConnectionResetError:
-                disconnected.append(ws)
-                
-        # Clean up disconnected sockets
-        for ws in disconnected:
-            self.websockets.remove(ws)
+        # Encode once and hand the same buffer to each batch of clients
+        # concurrently, yielding between batches so a large audience doesn't
+        # stall other handlers. Frames stay TEXT so browser clients keep
+        # receiving strings.
+        send = _encoded_sender(_dumps(message))
+        snapshot = list(self.websockets)
+        failed = set()
+        for i in range(0, len(snapshot), _FAN_OUT_BATCH):
+            batch = snapshot[i:i + _FAN_OUT_BATCH]
+            results = await asyncio.gather(
+                *(send(ws) for ws in batch),
+                return_exceptions=True
+            )
+            failed.update(ws for ws, result in zip(batch, results) if isinstance(result, Exception))
+            await asyncio.sleep(0)
+        
+        # Drop sockets whose send failed
+        self.websockets -= failed
     
     # MCP Bridge integration endpoints
     async def handle_mcp_tool_request(self, request: Request) -> Response:
         """Forward tool requests to MCP Bridge"""
-        data = await request.json()
+        data = await _read_json(request)
         self.log_request(request, data)
         
         # TODO: Integrate with actual MCP Bridge
-        return json_response({
+        return _json_response({
             'success': True,
             'data': {
                 'tool': data.get('tool'),
@@ -487,16 +822,14 @@ class UnifiedServer:
     
     async def handle_mcp_status(self, request: Request) -> Response:
         """Get MCP Bridge connection status"""
-        return json_response({
-            'connected': False,  # TODO: Check actual MCP Bridge status
-            'message': 'MCP Bridge integration pending'
-        })
+        # TODO: Check actual MCP Bridge status
+        return Response(body=_MCP_STATUS_BODY, content_type='application/json')
     
     # Server lifecycle methods
     async def start(self) -> str:
         """Start the server on an available port"""
-        # Find available port
-        self.port = self.find_available_port()
+        # Find available port without blocking the event loop
+        self.port = await asyncio.to_thread(self.find_available_port)
         if not self.port:
             raise RuntimeError(f"No available ports in range {self.port_range}")
         
@@ -525,32 +858,32 @@ class UnifiedServer:
         self.log_request(request)
         
         try:
-            data = await request.json()
+            data = await _read_json(request)
             plugin_id = data.get('id')
             
             if not plugin_id:
-                return json_response({'error': 'Plugin ID required'}, status=400)
+                return _json_response({'error': 'Plugin ID required'}, status=400)
             
             # Store plugin registration
-            self.registered_plugins[plugin_id] = {
-                'id': plugin_id,
-                'name': data.get('name', plugin_id),
-                'type': data.get('type', 'unknown'),
-                'version': data.get('version', '1.0.0'),
-                'capabilities': data.get('capabilities', []),
-                'registered_at': datetime.now().isoformat(),
-                'status': 'active'
-            }
+            self.registered_plugins[plugin_id] = PluginRecord(
+                id=plugin_id,
+                name=data.get('name', plugin_id),
+                type=data.get('type', 'unknown'),
+                version=data.get('version', '1.0.0'),
+                capabilities=data.get('capabilities', []),
+                registered_at=datetime.now().isoformat()
+            )
             
             logger.info(f"Plugin registered: {plugin_id}")
             
             # Broadcast plugin registration
-            await self._broadcast_websocket({
-                'type': 'plugin_registered',
-                'plugin': self.registered_plugins[plugin_id]
-            })
+            if self._has_listeners():
+                self._broadcast_soon({
+                    'type': 'plugin_registered',
+                    'plugin': self.registered_plugins[plugin_id].to_dict()
+                })
             
-            return json_response({
+            return _json_response({
                 'success': True,
                 'plugin_id': plugin_id,
                 'message': f'Plugin {plugin_id} registered successfully'
@@ -558,24 +891,27 @@ class UnifiedServer:
             
         except Exception as e:
             logger.error(f"Plugin registration error: {e}")
-            return json_response({'error': str(e)}, status=500)
+            return _json_response({'error': str(e)}, status=500)
     
     async def handle_plugin_list(self, request: Request) -> Response:
         """List all registered plugins"""
-        return json_response({
-            'plugins': list(self.registered_plugins.values()),
-            'count': len(self.registered_plugins)
-        })
+        # Splice the cached per-plugin encodings instead of re-encoding every record
+        plugins = self.registered_plugins
+        body = b'{"plugins":[%b],"count":%d}' % (
+            b','.join(p.json_bytes() for p in plugins.values()),
+            len(plugins)
+        )
+        return Response(body=body, content_type='application/json')
     
     async def handle_plugin_execute(self, request: Request) -> Response:
         """Execute a plugin action"""
         plugin_id = request.match_info['plugin_id']
         
         if plugin_id not in self.registered_plugins:
-            return json_response({'error': 'Plugin not found'}, status=404)
+            return _json_response({'error': 'Plugin not found'}, status=404)
         
         try:
-            data = await request.json()
+            data = await _read_json(request)
             action = data.get('action')
             params = data.get('params', {})
             
@@ -587,63 +923,62 @@ class UnifiedServer:
                     'type': 'execute_action',
                     'action': action,
                     'params': params,
-                    'request_id': str(uuid.uuid4())
+                    'request_id': secrets.token_hex(16)
                 })
                 
-                return json_response({
+                return _json_response({
                     'success': True,
                     'message': 'Action sent to plugin',
                     'async': True
                 })
             else:
                 # Plugin not connected, queue for later or return error
-                return json_response({
+                return _json_response({
                     'error': 'Plugin not connected',
                     'plugin_id': plugin_id
                 }, status=503)
                 
         except Exception as e:
             logger.error(f"Plugin execution error: {e}")
-            return json_response({'error': str(e)}, status=500)
+            return _json_response({'error': str(e)}, status=500)
     
     async def handle_plugin_status(self, request: Request) -> Response:
         """Get plugin status"""
         plugin_id = request.match_info['plugin_id']
         
         if plugin_id not in self.registered_plugins:
-            return json_response({'error': 'Plugin not found'}, status=404)
+            return _json_response({'error': 'Plugin not found'}, status=404)
         
-        plugin = self.registered_plugins[plugin_id]
+        plugin = self.registered_plugins[plugin_id].to_dict()
         plugin['connected'] = plugin_id in self.plugin_connections and not self.plugin_connections[plugin_id].closed
         
-        return json_response(plugin)
+        return _json_response(plugin)
     
     async def handle_plugin_unregister(self, request: Request) -> Response:
         """Unregister a plugin"""
         plugin_id = request.match_info['plugin_id']
         
         if plugin_id not in self.registered_plugins:
-            return json_response({'error': 'Plugin not found'}, status=404)
+            return _json_response({'error': 'Plugin not found'}, status=404)
         
         # Remove plugin
         del self.registered_plugins[plugin_id]
         
         # Close WebSocket if connected
-        if plugin_id in self.plugin_connections:
-            ws = self.plugin_connections[plugin_id]
-            if not ws.closed:
-                await ws.close()
-            del self.plugin_connections[plugin_id]
+        ws = self.plugin_connections.pop(plugin_id, None)
+        if ws is not None and not ws.closed:
+            await ws.close()
         
         logger.info(f"Plugin unregistered: {plugin_id}")
         
         # Broadcast plugin removal
-        await self._broadcast_websocket({
-            'type': 'plugin_unregistered',
-            'plugin_id': plugin_id
-        })
+        if self._has_listeners():
+            self._broadcast_soon({
+                'type': 'plugin_unregistered',
+                'plugin_id': plugin_id
+            })
         
-        return json_response({
+        return _json_response({
             'success': True,
             'message': f'Plugin {plugin_id} unregistered'
         })
@@ -663,46 +998,54 @@ class UnifiedServer:
         logger.info(f"Plugin WebSocket connected: {plugin_id}")
         
         # Update plugin status
-        self.registered_plugins[plugin_id]['status'] = 'connected'
+        self.registered_plugins[plugin_id].set_status('connected')
         
         # Send welcome message
         await ws.send_json({
             'type': 'connected',
             'message': f'Plugin {plugin_id} connected to Unified Backend',
-            'plugin': self.registered_plugins[plugin_id]
+            'plugin': self.registered_plugins[plugin_id].to_dict()
         })
         
         try:
             async for msg in ws:
-                if msg.type == web.WSMsgType.TEXT:
-                    data = json.loads(msg.data)
+                if msg.type is web.WSMsgType.TEXT:
+                    data = msg.json(loads=_loads)
                     logger.info(f"Plugin {plugin_id} message: {data.get('type', 'unknown')}")
                     
                     # Handle plugin messages
-                    if data.get('type') == 'status_update':
-                        self.registered_plugins[plugin_id].update(data.get('status', {}))
-                    elif data.get('type') == 'action_result':
-                        # Broadcast result to interested parties
-                        await self._broadcast_websocket({
-                            'type': 'plugin_action_result',
-                            'plugin_id': plugin_id,
-                            'result': data.get('result')
-                        })
+                    handler = self._plugin_message_handlers.get(data.get('type'))
+                    if handler:
+                        await handler(plugin_id, data)
                     
-                elif msg.type == web.WSMsgType.ERROR:
+                elif msg.type is web.WSMsgType.ERROR:
                     logger.error(f'Plugin WebSocket error: {ws.exception()}')
                     
         except Exception as e:
             logger.error(f"Plugin WebSocket error: {e}")
         finally:
-            # Clean up
-            if plugin_id in self.plugin_connections:
+            # Clean up; the plugin may have been unregistered or reconnected meanwhile
+            if self.plugin_connections.get(plugin_id) is ws:
                 del self.plugin_connections[plugin_id]
-            self.registered_plugins[plugin_id]['status'] = 'disconnected'
+            if plugin_id in self.registered_plugins:
+                self.registered_plugins[plugin_id].set_status('disconnected')
             logger.info(f"Plugin WebSocket disconnected: {plugin_id}")
             
         return ws
     
+    async def _plugin_status_update(self, plugin_id: str, data: Dict[str, Any]):
+        """Plugin message: merge a status update into the plugin record"""
+        self.registered_plugins[plugin_id].update(data.get('status', {}))
+    
+    async def _plugin_action_result(self, plugin_id: str, data: Dict[str, Any]):
+        """Plugin message: broadcast an action result to interested parties"""
+        if self._has_listeners():
+            await self._broadcast_websocket({
+                'type': 'plugin_action_result',
+                'plugin_id': plugin_id,
+                'result': data.get('result')
+            })
+    
     # Event system methods
     async def _init_event_system(self, app):
         """Initialize the event system on startup"""
@@ -710,8 +1053,17 @@ class UnifiedServer:
             return
             
         try:
-            # Create MongoDB client
-            self.mongo_client = AsyncIOMotorClient(self.mongo_uri)
+            # Create MongoDB client with a warm connection pool
+            self.mongo_client = AsyncIOMotorClient(
+                self.mongo_uri,
+                maxPoolSize=100,
+                minPoolSize=10,
+                compressors=_MONGO_COMPRESSORS,
+                retryWrites=True,
+                serverSelectionTimeoutMS=2000
+            )
+            if not _MONGO_COMPRESSORS:
+                logger.info("MongoDB wire compression disabled: install zstandard or python-snappy to enable it")
             db = self.mongo_client["py_mcp_bridge_events"]
             
             # Initialize event system
@@ -726,6 +1078,15 @@ class UnifiedServer:
     
     async def _cleanup_event_system(self, app):
         """Cleanup event system on shutdown"""
+        if self._event_flush_task:
+            self._event_flush_task.cancel()
+            await asyncio.gather(self._event_flush_task, return_exceptions=True)
+            self._event_flush_task = None
+        for _, future in self._event_batch:
+            future.cancel()
+        self._event_batch = []
+        self._unsubscribe_fan_out()
+            
         if self.event_system:
             await self.event_system.shutdown()
             
@@ -736,11 +1097,10 @@ class UnifiedServer:
     async def handle_publish_event(self, request: Request) -> Response:
         """Publish an event to the event bus"""
         if not self.event_system:
-            return json_response({'error': 'Event system not available'}, status=503)
+            return _json_response({'error': 'Event system not available'}, status=503)
         
         try:
-            data = await request.json()
-            event_bus = self.event_system.get_event_bus()
+            data = await _read_json(request)
             
             # Create and publish event
             from ..core.events import Event, EventType, Priority
@@ -752,24 +1112,86 @@ class UnifiedServer:
                 correlation_id=data.get('correlation_id')
             )
             
-            event_id = await event_bus.publish(event)
+            event_id = await self._publish_batched(event)
             
-            return json_response({
+            return _json_response({
                 'event_id': event_id,
                 'status': 'published'
             })
             
         except Exception as e:
             logger.error(f"Failed to publish event: {e}")
-            return json_response({'error': str(e)}, status=500)
+            return _json_response({'error': str(e)}, status=500)
+    
+    async def _publish_batched(self, event) -> str:
+        """Queue an event for the next batched insert and wait for its ID"""
+        future = asyncio.get_running_loop().create_future()
+        self._event_batch.append((event, future))
+        
+        if self._event_flush_task is None:
+            self._event_flush_task = asyncio.create_task(self._flush_events())
+            
+        return await future
+    
+    async def _flush_events(self):
+        """Publish everything queued during one batch window"""
+        await asyncio.sleep(self._event_batch_window)
+        
+        # Events published from here on wait for this insert to finish
+        # and go out in the next batch
+        batch, self._event_batch = self._event_batch, []
+        
+        try:
+            await self._insert_event_batch(batch)
+        except asyncio.CancelledError:
+            for _, future in batch:
+                future.cancel()
+            raise
+            
+        self._event_flush_task = None
+        if self._event_batch:
+            self._event_flush_task = asyncio.create_task(self._flush_events())
+    
+    async def _insert_event_batch(self, batch: List[tuple]):
+        """Insert one batch and settle each publisher's future"""
+        try:
+            await self.event_system.get_event_bus().publish_many(
+                [event for event, _ in batch]
+            )
+        except BulkWriteError as e:
+            # The insert is unordered, so only the reported documents failed
+            write_errors = {
+                error['index']: error
+                for error in e.details.get('writeErrors', [])
+            }
+            for index, (event, future) in enumerate(batch):
+                if future.done():
+                    continue
+                error = write_errors.get(index)
+                if error is None:
+                    future.set_result(event.event_id)
+                else:
+                    future.set_exception(
+                        WriteError(error.get('errmsg'), error.get('code'), error)
+                    )
+            return
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+            
+        for event, future in batch:
+            if not future.done():
+                future.set_result(event.event_id)
     
     async def handle_queue_task(self, request: Request) -> Response:
         """Queue a task for execution"""
         if not self.event_system:
-            return json_response({'error': 'Event system not available'}, status=503)
+            return _json_response({'error': 'Event system not available'}, status=503)
         
         try:
-            data = await request.json()
+            data = await _read_json(request)
             task_queue = self.event_system.get_task_queue()
             
             # Queue task
@@ -781,27 +1203,41 @@ class UnifiedServer:
                 correlation_id=data.get('correlation_id')
             )
             
-            return json_response({
+            return _json_response({
                 'task_id': task_id,
                 'status': 'queued'
             })
             
         except Exception as e:
             logger.error(f"Failed to queue task: {e}")
-            return json_response({'error': str(e)}, status=500)
+            return _json_response({'error': str(e)}, status=500)
     
     async def handle_task_status(self, request: Request) -> Response:
-        """Get task status"""
+        """Get task status, optionally long-polling with ?wait=<seconds>"""
         if not self.event_system:
-            return json_response({'error': 'Event system not available'}, status=503)
+            return _json_response({'error': 'Event system not available'}, status=503)
         
         task_id = request.match_info['task_id']
         task_queue = self.event_system.get_task_queue()
         
-        # Check task results
-        if task_id in task_queue.task_results:
-            result = task_queue.task_results[task_id]
-            return json_response({
+        try:
+            wait = min(float(request.query.get('wait', 0)), _TASK_STATUS_MAX_WAIT)
+        except ValueError:
+            return _json_response({'error': 'wait must be a number of seconds'}, status=400)
+        
+        # Check task results; without one, long-poll until the task finishes
+        # or the wait runs out
+        result = task_queue.task_results.get(task_id)
+        if result is None and wait > 0:
+            completion = task_queue.completion_events.get(task_id)
+            if completion is not None:
+                try:
+                    await asyncio.wait_for(completion.wait(), timeout=wait)
+                except asyncio.TimeoutError:
+                    pass
+                result = task_queue.task_results.get(task_id)
+        if result is not None:
+            return _json_response({
                 'task_id': task_id,
                 'status': 'completed' if result.success else 'failed',
                 'result': result.result if result.success else None,
@@ -810,17 +1246,17 @@ class UnifiedServer:
         
         # Check active tasks
         if task_id in task_queue.active_tasks:
-            return json_response({
+            return _json_response({
                 'task_id': task_id,
                 'status': 'processing'
             })
         
-        return json_response({'error': 'Task not found'}, status=404)
+        return _json_response({'error': 'Task not found'}, status=404)
     
     async def handle_event_stats(self, request: Request) -> Response:
         """Get event system statistics"""
         if not self.event_system:
-            return json_response({'error': 'Event system not available'}, status=503)
+            return _json_response({'error': 'Event system not available'}, status=503)
         
         try:
             event_bus = self.event_system.get_event_bus()
@@ -829,35 +1265,42 @@ class UnifiedServer:
             event_stats = await event_bus.get_event_stats()
             queue_stats = task_queue.get_queue_stats()
             
-            return json_response({
+            return _json_response({
                 'event_stats': event_stats,
                 'queue_stats': queue_stats,
-                'timestamp': datetime.now().isoformat()
+                'websocket_events_dropped': self._ws_events_dropped,
+                'timestamp': self._now_iso
             })
             
         except Exception as e:
             logger.error(f"Failed to get stats: {e}")
-            return json_response({'error': str(e)}, status=500)
+            return _json_response({'error': str(e)}, status=500)
     
     async def handle_recent_events(self, request: Request) -> Response:
         """Get recent events"""
         if not self.event_system:
-            return json_response({'error': 'Event system not available'}, status=503)
+            return _json_response({'error': 'Event system not available'}, status=503)
+        
+        try:
+            limit = max(1, min(int(request.query.get('limit', 100)), _RECENT_EVENTS_MAX_LIMIT))
+        except ValueError:
+            return _json_response({'error': 'limit must be an integer'}, status=400)
         
         try:
-            limit = int(request.query.get('limit', 100))
             event_bus = self.event_system.get_event_bus()
             
             events = await event_bus.query_events(limit=limit)
             
-            return json_response({
+            # EventType and EventStatus are str enums, so both JSON encoders
+            # write their values without a .value lookup per event
+            return _json_response({
                 'events': [
                     {
                         'event_id': event.event_id,
-                        'event_type': event.event_type.value,
+                        'event_type': event.event_type,
                         'source': event.source,
-                        'status': event.status.value,
-                        'timestamp': event.timestamp.isoformat(),
+                        'status': event.status,
+                        'timestamp': event.timestamp,
                         'correlation_id': event.correlation_id
                     }
                     for event in events
@@ -867,7 +1310,7 @@ class UnifiedServer:
             
         except Exception as e:
             logger.error(f"Failed to get recent events: {e}")
-            return json_response({'error': str(e)}, status=500)
+            return _json_response({'error': str(e)}, status=500)
     
     async def handle_event_websocket(self, request: Request) -> web.WebSocketResponse:
         """WebSocket endpoint for real-time event streaming"""
@@ -879,34 +1322,68 @@ class UnifiedServer:
             await ws.close()
             return ws
         
-        # Subscribe to all events
-        event_queue = asyncio.Queue()
-        event_bus = self.event_system.get_event_bus()
+        # Join the shared fan-out; the server holds one event bus subscription
+        # for all clients and encodes each event once
+        event_queue: asyncio.Queue = asyncio.Queue(maxsize=_EVENT_WS_QUEUE_SIZE)
+        self._ws_clients[ws] = event_queue
+        if self._event_subscription is None:
+            self._event_subscription = self.event_system.get_event_bus().subscribe_all(self._fan_out_event)
         
-        async def event_handler(event):
-            await event_queue.put(event)
+        async def send_events():
+            # Send events as they arrive, coalescing any backlog into one
+            # JSON array per frame
+            try:
+                while True:
+                    batch = [await event_queue.get()]
+                    while len(batch) < _EVENT_WS_MAX_BATCH and not event_queue.empty():
+                        batch.append(event_queue.get_nowait())
+                    await _send_encoded(ws, b'[%b]' % b','.join(batch))
+            except Exception as e:
+                logger.error(f"Event WebSocket error: {e}")
+                await ws.close()
         
-        event_bus.subscribe_all(event_handler)
+        sender = asyncio.create_task(send_events())
         
         try:
-            # Send events as they arrive
-            while True:
-                event = await event_queue.get()
-                await ws.send_json({
-                    'event_id': event.event_id,
-                    'event_type': event.event_type.value,
-                    'source': event.source,
-                    'data': event.data,
-                    'timestamp': event.timestamp.isoformat()
-                })
-                
-        except Exception as e:
-            logger.error(f"Event WebSocket error: {e}")
+            # Reading keeps close frames flowing so a disconnect ends the handler
+            async for msg in ws:
+                if msg.type is web.WSMsgType.ERROR:
+                    logger.error(f'Event WebSocket error: {ws.exception()}')
         finally:
+            del self._ws_clients[ws]
+            if not self._ws_clients:
+                self._unsubscribe_fan_out()
+            sender.cancel()
+            await asyncio.gather(sender, return_exceptions=True)
             await ws.close()
         
         return ws
     
+    async def _fan_out_event(self, event):
+        """Encode an event once and queue it for every /ws/events client"""
+        if not self._ws_clients:
+            return
+            
+        payload = _dumps({
+            'event_id': event.event_id,
+            'event_type': event.event_type,
+            'source': event.source,
+            'data': event.data,
+            'timestamp': event.timestamp
+        })
+        for event_queue in self._ws_clients.values():
+            # Never block the event bus on a slow client; drop its oldest event instead
+            if event_queue.full():
+                event_queue.get_nowait()
+                self._ws_events_dropped += 1
+            event_queue.put_nowait(payload)
+    
+    def _unsubscribe_fan_out(self):
+        """Drop the shared event bus subscription"""
+        if self._event_subscription is not None and self.event_system:
+            self.event_system.get_event_bus().unsubscribe(self._event_subscription)
+        self._event_subscription = None
+    
     async def stop(self):
         """Stop the server"""
         if self.site:
@@ -920,20 +1397,64 @@ class UnifiedServer:
         """Register a custom OAuth handler for a service"""
         self.oauth_handlers[service] = handler
     
+    def store_oauth_callback(self, callback_id: str, data: Dict[str, Any]):
+        """Add a pending OAuth callback, evicting expired and excess entries.
+        
+        Always store callbacks through this method rather than writing to
+        oauth_callbacks, so their expiry and service index stay in step.
+        """
+        self._expire_oauth_callbacks()
+        # Replacing an ID starts it over with a new deadline and service
+        self._drop_oauth_callback(callback_id)
+        self.oauth_callbacks[callback_id] = data
+        self._track_oauth_callback(callback_id, data)
+        while len(self.oauth_callbacks) > _OAUTH_CALLBACK_MAX:
+            self._drop_oauth_callback(next(iter(self.oauth_callbacks)))
+    
     def get_oauth_callback(self, callback_id: str) -> Optional[Dict[str, Any]]:
         """Retrieve and remove an OAuth callback by ID"""
-        return self.oauth_callbacks.pop(callback_id, None)
+        self._expire_oauth_callbacks()
+        return self._drop_oauth_callback(callback_id)
     
     def get_pending_oauth_callbacks(self, service: Optional[str] = None) -> List[Dict[str, Any]]:
         """Get all pending OAuth callbacks, optionally filtered by service"""
-        callbacks = []
-        for callback_id, data in self.oauth_callbacks.items():
-            if service is None or data.get('service') == service:
-                callbacks.append({
-                    'id': callback_id,
-                    **data
-                })
-        return callbacks
+        self._expire_oauth_callbacks()
+        if service is None:
+            callback_ids = self.oauth_callbacks.keys()
+        else:
+            callback_ids = self._oauth_by_service.get(service, ())
+        return [
+            {'id': callback_id, **self.oauth_callbacks[callback_id]}
+            for callback_id in callback_ids
+        ]
+    
+    def _track_oauth_callback(self, callback_id: str, data: Dict[str, Any]):
+        """Give a stored callback its deadline and per-service index entry"""
+        self._oauth_deadlines[callback_id] = time.monotonic() + _OAUTH_CALLBACK_TTL
+        self._oauth_by_service[data.get('service')][callback_id] = None
+    
+    def _expire_oauth_callbacks(self):
+        """Drop callbacks past their TTL; entries are stored oldest first"""
+        now = time.monotonic()
+        while self.oauth_callbacks:
+            oldest = next(iter(self.oauth_callbacks))
+            if self._oauth_deadlines[oldest] > now:
+                break
+            self._drop_oauth_callback(oldest)
+    
+    def _drop_oauth_callback(self, callback_id: str) -> Optional[Dict[str, Any]]:
+        """Remove a callback from the store and the per-service index"""
+        data = self.oauth_callbacks.pop(callback_id, None)
+        if data is None:
+            return None
+        self._oauth_deadlines.pop(callback_id, None)
+        service = data.get('service')
+        callback_ids = self._oauth_by_service.get(service)
+        if callback_ids is not None:
+            callback_ids.pop(callback_id, None)
+            if not callback_ids:
+                del self._oauth_by_service[service]
+        return data
 
 
 # Convenience function to create and configure app
@@ -945,6 +1466,7 @@ def create_app(port_range: tuple = (3000, 3003)) -> UnifiedServer:
 # Example usage and standalone running
 if __name__ == "__main__":
     import asyncio
+    import signal
     
     async def main():
         # Configure logging
@@ -968,13 +1490,21 @@ if __name__ == "__main__":
         print(f"  WebSocket: ws://localhost:{server.port}/ws")
         print(f"\nPress Ctrl+C to stop\n")
         
+        stop_event = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sig, stop_event.set)
+            except NotImplementedError:
+                # Windows: Ctrl+C still interrupts asyncio.run, which cancels us
+                pass
+        
         try:
-            # Keep server running
-            while True:
-                await asyncio.sleep(1)
-        except KeyboardInterrupt:
+            # Keep server running; the loop stays idle until a shutdown signal
+            await stop_event.wait()
             print("\nShutting down...")
         finally:
             await server.stop()
     
+    install_uvloop()
     asyncio.run(main())
\ No newline at end of file
@@ -0,0 +1,65 @@
+"""
+Tests for the prompt training middleware lifecycle.
+"""
+import asyncio
+
+import pytest
+
+from prompt_training.integration import PromptTrainingMiddleware
+
+
+@pytest.fixture
+def middleware(tmp_path, monkeypatch):
+    """Create a middleware whose storage lives in a temporary directory."""
+    monkeypatch.chdir(tmp_path)
+    return PromptTrainingMiddleware(enabled=True, openai_api_key="test-key")
+
+
+def other_tasks():
+    """Tasks still pending besides the running test."""
+    current = asyncio.current_task()
+    return {task for task in asyncio.all_tasks() if task is not current and not task.done()}
+
+
+class TestMiddlewareLifecycle:
+    """Test starting and stopping the training services."""
+    
+    @pytest.mark.asyncio
+    async def test_start_keeps_service_tasks(self, middleware):
+        """The collector and trainer loops are held by their owners."""
+        await middleware.start()
+        
+        try:
+            assert middleware.feedback_collector._process_task is not None
+            assert not middleware.feedback_collector._process_task.done()
+            assert middleware.auto_trainer._monitor_task is not None
+            assert not middleware.auto_trainer._monitor_task.done()
+        finally:
+            await middleware.shutdown()
+    
+    @pytest.mark.asyncio
+    async def test_no_task_survives_shutdown(self, middleware):
+        """shutdown() cancels and awaits every loop it started."""
+        before = other_tasks()
+        await middleware.start()
+        started = other_tasks() - before
+        assert len(started) == 2
+        
+        await middleware.shutdown()
+        
+        assert all(task.done() for task in started)
+        assert other_tasks() == before
+        assert middleware.feedback_collector._process_task is None
+        assert middleware.auto_trainer._monitor_task is None
+    
+    @pytest.mark.asyncio
+    async def test_start_is_idempotent(self, middleware):
+        """Starting twice does not spawn a second set of loops."""
+        before = other_tasks()
+        await middleware.start()
+        await middleware.start()
+        
+        try:
+            assert len(other_tasks() - before) == 2
+        finally:
+            await middleware.shutdown()
@@ -0,0 +1,454 @@
+"""
+Tests for the unified backend server.
+"""
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+
+import pytest
+from aiohttp import WSMsgType
+from aiohttp.test_utils import TestClient, TestServer
+from pymongo.errors import BulkWriteError, WriteError
+
+import unified_backend.server as server_module
+from unified_backend.server import UnifiedServer
+from core.events import Event, EventBus, EventType, TaskQueue
+
+
+@pytest.fixture
+def server():
+    """Create a UnifiedServer without the MongoDB event system."""
+    return UnifiedServer(enable_events=False)
+
+
+class FakeEventBus:
+    """Event bus stand-in that records batches and can fail inserts."""
+    
+    def __init__(self, error=None):
+        self.batches = []
+        self.error = error
+        self.release = asyncio.Event()
+        self.release.set()
+    
+    async def publish_many(self, events):
+        self.batches.append([event.event_id for event in events])
+        await self.release.wait()
+        if self.error:
+            raise self.error
+        return [event.event_id for event in events]
+
+
+class FakeCollection:
+    """MongoDB collection stand-in that accepts and drops writes."""
+    
+    def __init__(self):
+        self.on_insert = None
+    
+    async def insert_one(self, document):
+        if self.on_insert:
+            self.on_insert(document)
+    
+    async def insert_many(self, documents, ordered=True):
+        pass
+    
+    async def update_one(self, *args, **kwargs):
+        pass
+
+
+class FakeEventSystem:
+    """EventSystemManager stand-in backed by a real bus and task queue."""
+    
+    def __init__(self):
+        self.collection = FakeCollection()
+        self.event_bus = EventBus({'events': self.collection})
+        self.task_queue = TaskQueue(self.event_bus)
+    
+    def get_event_bus(self):
+        return self.event_bus
+    
+    def get_task_queue(self):
+        return self.task_queue
+    
+    async def shutdown(self):
+        pass
+
+
+@asynccontextmanager
+async def app_client(server):
+    """Serve the server's app on a test client."""
+    app = await server.create_app()
+    async with TestClient(TestServer(app)) as client:
+        yield client
+
+
+@asynccontextmanager
+async def event_client(server, monkeypatch):
+    """Serve the app with a FakeEventSystem in place of MongoDB."""
+    monkeypatch.setattr(server_module, 'event_system_available', True)
+    server.enable_events = True
+    
+    async def init_event_system(app):
+        server.event_system = FakeEventSystem()
+    
+    server._init_event_system = init_event_system
+    async with app_client(server) as client:
+        yield client
+
+
+def use_event_bus(server, bus):
+    """Point the server's event system at a fake bus."""
+    async def shutdown():
+        pass
+    
+    server.event_system = SimpleNamespace(get_event_bus=lambda: bus, shutdown=shutdown)
+
+
+class TestOAuthCallbackStore:
+    """Test pending OAuth callback storage."""
+    
+    def test_pending_callbacks_keep_arrival_order_per_service(self, server):
+        """Filtering by service returns callbacks in the order they arrived."""
+        ids = [f"cb{i}" for i in range(20)]
+        for i, callback_id in enumerate(ids):
+            server.store_oauth_callback(callback_id, {'service': 'gmail' if i % 2 else 'slack'})
+        
+        gmail = [cb['id'] for cb in server.get_pending_oauth_callbacks('gmail')]
+        assert gmail == ids[1::2]
+        assert [cb['id'] for cb in server.get_pending_oauth_callbacks()] == ids
+        assert server.get_pending_oauth_callbacks('github') == []
+    
+    def test_get_oauth_callback_removes_from_index(self, server):
+        """Claiming a callback removes it from the store and its service index."""
+        server.store_oauth_callback('cb1', {'service': 'gmail', 'code': 'abc'})
+        
+        assert server.get_oauth_callback('cb1') == {'service': 'gmail', 'code': 'abc'}
+        assert server.get_oauth_callback('cb1') is None
+        assert server.get_pending_oauth_callbacks('gmail') == []
+        assert 'gmail' not in server._oauth_by_service
+    
+    def test_callbacks_expire_after_ttl(self, server, monkeypatch):
+        """Callbacks past their TTL are dropped on the next read."""
+        monkeypatch.setattr(server_module, '_OAUTH_CALLBACK_TTL', 0)
+        server.store_oauth_callback('cb1', {'service': 'gmail'})
+        
+        assert server.get_pending_oauth_callbacks() == []
+        assert not server.oauth_callbacks
+        assert not server._oauth_deadlines
+        assert not server._oauth_by_service
+    
+    def test_store_is_capped(self, server, monkeypatch):
+        """The oldest callbacks are evicted once the cap is exceeded."""
+        monkeypatch.setattr(server_module, '_OAUTH_CALLBACK_MAX', 3)
+        for i in range(5):
+            server.store_oauth_callback(f"cb{i}", {'service': 'gmail'})
+        
+        assert list(server.oauth_callbacks) == ['cb2', 'cb3', 'cb4']
+        assert [cb['id'] for cb in server.get_pending_oauth_callbacks('gmail')] == ['cb2', 'cb3', 'cb4']
+    
+    def test_storing_existing_id_replaces_it(self, server):
+        """Re-storing an ID moves it to its new service and arrival slot."""
+        server.store_oauth_callback('cb1', {'service': 'gmail'})
+        server.store_oauth_callback('cb2', {'service': 'gmail'})
+        server.store_oauth_callback('cb1', {'service': 'slack'})
+        
+        assert list(server.oauth_callbacks) == ['cb2', 'cb1']
+        assert [cb['id'] for cb in server.get_pending_oauth_callbacks('gmail')] == ['cb2']
+        assert server.get_pending_oauth_callbacks('slack') == [{'id': 'cb1', 'service': 'slack'}]
+
+
+class TestEventBatching:
+    """Test batched event publishing."""
+    
+    @pytest.mark.asyncio
+    async def test_bulk_write_error_fails_only_reported_events(self, server):
+        """Events outside writeErrors still resolve to their IDs."""
+        use_event_bus(server, FakeEventBus(BulkWriteError({
+            'writeErrors': [{'index': 1, 'code': 11000, 'errmsg': 'duplicate key'}]
+        })))
+        
+        results = await asyncio.gather(
+            *(server._publish_batched(SimpleNamespace(event_id=f"e{i}")) for i in range(3)),
+            return_exceptions=True
+        )
+        
+        assert results[0] == 'e0'
+        assert isinstance(results[1], WriteError)
+        assert results[1].code == 11000
+        assert results[2] == 'e2'
+    
+    @pytest.mark.asyncio
+    async def test_flush_task_held_until_insert_finishes(self, server):
+        """Cleanup can cancel an insert that is still in flight."""
+        bus = FakeEventBus()
+        bus.release.clear()
+        use_event_bus(server, bus)
+        
+        publish = asyncio.ensure_future(server._publish_batched(SimpleNamespace(event_id='e0')))
+        while not bus.batches:
+            await asyncio.sleep(0)
+        
+        assert server._event_flush_task is not None
+        await server._cleanup_event_system(None)
+        
+        assert publish.cancelled()
+        assert server._event_flush_task is None
+    
+    @pytest.mark.asyncio
+    async def test_events_queued_during_insert_go_in_next_batch(self, server):
+        """A new flush starts once the in-flight insert completes."""
+        bus = FakeEventBus()
+        bus.release.clear()
+        use_event_bus(server, bus)
+        
+        first = asyncio.ensure_future(server._publish_batched(SimpleNamespace(event_id='e0')))
+        while not bus.batches:
+            await asyncio.sleep(0)
+        second = asyncio.ensure_future(server._publish_batched(SimpleNamespace(event_id='e1')))
+        await asyncio.sleep(0)
+        bus.release.set()
+        
+        assert await asyncio.gather(first, second) == ['e0', 'e1']
+        assert bus.batches == [['e0'], ['e1']]
+
+
+class TestTaskStatus:
+    """Test the task status endpoint."""
+    
+    @pytest.mark.asyncio
+    async def test_completion_event_registered_before_publish(self):
+        """A task that finishes while being published still has its event."""
+        events = FakeEventSystem()
+        registered = []
+        events.collection.on_insert = lambda doc: registered.append(
+            doc['_id'] in events.task_queue.completion_events
+        )
+        
+        await events.task_queue.queue_task('noop', {})
+        
+        assert registered == [True]
+    
+    @pytest.mark.asyncio
+    async def test_wait_returns_when_task_completes(self, server, monkeypatch):
+        """?wait= answers as soon as the task finishes, not at the timeout."""
+        async with event_client(server, monkeypatch) as client:
+            task_queue = server.event_system.get_task_queue()
+            
+            async def handler(data):
+                await asyncio.sleep(0.1)
+                return data
+            
+            task_queue.register_task_handler('echo', handler)
+            task_id = await task_queue.queue_task('echo', {'a': 1})
+            task = Event(EventType.TASK_QUEUED, 'test', {'task_type': 'echo', 'task_data': {'a': 1}})
+            task.event_id = task_id
+            asyncio.create_task(task_queue._execute_task(task))
+            
+            start = time.monotonic()
+            resp = await client.get(f"/api/tasks/{task_id}?wait=5")
+            
+            assert time.monotonic() - start < 2
+            assert await resp.json() == {
+                'task_id': task_id, 'status': 'completed', 'result': {'a': 1}, 'error': None
+            }
+            assert task_id not in task_queue.completion_events
+            
+            # A finished task answers immediately, without waiting
+            start = time.monotonic()
+            resp = await client.get(f"/api/tasks/{task_id}?wait=5")
+            assert time.monotonic() - start < 1
+            assert (await resp.json())['status'] == 'completed'
+    
+    @pytest.mark.asyncio
+    async def test_wait_must_be_a_number(self, server, monkeypatch):
+        """A non-numeric wait is rejected."""
+        async with event_client(server, monkeypatch) as client:
+            resp = await client.get("/api/tasks/abc?wait=soon")
+            
+            assert resp.status == 400
+
+
+async def wait_until(predicate, timeout=2.0):
+    """Yield to the server until predicate() holds or the timeout passes."""
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "condition not reached"
+        await asyncio.sleep(0.01)
+
+
+class TestEventWebSocket:
+    """Test the /ws/events fan-out."""
+    
+    @pytest.mark.asyncio
+    async def test_subscription_dropped_when_last_client_leaves(self, server, monkeypatch):
+        """One bus subscription is shared and removed with the last client."""
+        async with event_client(server, monkeypatch) as client:
+            bus = server.event_system.get_event_bus()
+            first = await client.ws_connect('/ws/events')
+            second = await client.ws_connect('/ws/events')
+            await wait_until(lambda: len(server._ws_clients) == 2)
+            
+            assert bus.global_handlers == [server._fan_out_event]
+            
+            await bus._dispatch_event(Event(EventType.TASK_EVENT, 'test', {'n': 1}))
+            for ws in (first, second):
+                events = await asyncio.wait_for(ws.receive_json(), 2)
+                assert [event['data'] for event in events] == [{'n': 1}]
+            
+            await first.close()
+            await wait_until(lambda: len(server._ws_clients) == 1)
+            assert bus.global_handlers == [server._fan_out_event]
+            
+            await second.close()
+            await wait_until(lambda: not server._ws_clients)
+            assert bus.global_handlers == []
+            assert server._event_subscription is None
+            
+            # The next client subscribes again
+            third = await client.ws_connect('/ws/events')
+            await wait_until(lambda: len(server._ws_clients) == 1)
+            assert bus.global_handlers == [server._fan_out_event]
+            await third.close()
+
+
+class TestPluginRecords:
+    """Test plugin records served from their cached encoding."""
+    
+    @staticmethod
+    async def list_plugin(client):
+        resp = await client.get('/api/plugins')
+        (plugin,) = (await resp.json())['plugins']
+        return plugin
+    
+    @pytest.mark.asyncio
+    async def test_status_update_refreshes_listing(self, server):
+        """Changes over the plugin WebSocket show up in /api/plugins."""
+        async with app_client(server) as client:
+            await client.post('/api/plugins/register', json={'id': 'p1', 'capabilities': ['x']})
+            assert (await self.list_plugin(client))['status'] == 'active'
+            
+            ws = await client.ws_connect('/ws/plugin/p1')
+            assert (await ws.receive_json())['type'] == 'connected'
+            assert (await self.list_plugin(client))['status'] == 'connected'
+            
+            await ws.send_json({'type': 'status_update', 'status': {'status': 'busy', 'battery': 50}})
+            await wait_until(lambda: server.registered_plugins['p1'].status == 'busy')
+            plugin = await self.list_plugin(client)
+            assert plugin['status'] == 'busy'
+            assert plugin['battery'] == 50
+            
+            await ws.close()
+            await wait_until(lambda: not server.plugin_connections)
+            assert (await self.list_plugin(client))['status'] == 'disconnected'
+
+
+class TestCors:
+    """Test CORS handling for browser clients."""
+    
+    ORIGIN = 'chrome-extension://abcdef'
+    
+    @pytest.mark.asyncio
+    async def test_preflight_echoes_request(self, server):
+        """Preflights allow the origin, method and headers that were asked for."""
+        async with app_client(server) as client:
+            resp = await client.options('/api/plugins/register', headers={
+                'Origin': self.ORIGIN,
+                'Access-Control-Request-Method': 'POST',
+                'Access-Control-Request-Headers': 'Content-Type',
+            })
+            
+            assert resp.status == 200
+            assert resp.headers['Access-Control-Allow-Origin'] == self.ORIGIN
+            assert resp.headers['Access-Control-Allow-Credentials'] == 'true'
+            assert resp.headers['Access-Control-Allow-Methods'] == 'POST'
+            assert resp.headers['Access-Control-Allow-Headers'] == 'Content-Type'
+            assert 'Access-Control-Expose-Headers' not in resp.headers
+    
+    @pytest.mark.asyncio
+    async def test_preflight_answered_for_unknown_path(self, server):
+        """The middleware answers preflights before routing."""
+        async with app_client(server) as client:
+            resp = await client.options('/no/such/route', headers={
+                'Origin': self.ORIGIN,
+                'Access-Control-Request-Method': 'GET',
+            })
+            
+            assert resp.status == 200
+            assert resp.headers['Access-Control-Allow-Origin'] == self.ORIGIN
+            assert 'Access-Control-Allow-Headers' not in resp.headers
+    
+    @pytest.mark.asyncio
+    async def test_simple_request_headers(self, server):
+        """Responses to a browser origin carry CORS headers; others do not."""
+        async with app_client(server) as client:
+            resp = await client.get('/health', headers={'Origin': self.ORIGIN})
+            
+            assert resp.status == 200
+            assert resp.headers['Access-Control-Allow-Origin'] == self.ORIGIN
+            assert resp.headers['Access-Control-Allow-Credentials'] == 'true'
+            exposed = resp.headers['Access-Control-Expose-Headers'].split(',')
+            assert 'Content-Type' not in exposed
+            
+            resp = await client.get('/health')
+            assert 'Access-Control-Allow-Origin' not in resp.headers
+    
+    @pytest.mark.asyncio
+    async def test_websocket_upgrade_headers(self, server):
+        """The 101 upgrade response carries CORS headers too."""
+        async with app_client(server) as client:
+            resp = await client.get('/ws', headers={
+                'Origin': self.ORIGIN,
+                'Connection': 'Upgrade',
+                'Upgrade': 'websocket',
+                'Sec-WebSocket-Version': '13',
+                'Sec-WebSocket-Key': 'dGhlIHNhbXBsZSBub25jZQ==',
+            })
+            
+            assert resp.status == 101
+            assert resp.headers['Access-Control-Allow-Origin'] == self.ORIGIN
+            assert resp.headers['Access-Control-Allow-Credentials'] == 'true'
+            resp.close()
+
+
+class TestBroadcast:
+    """Test broadcasts to /ws clients."""
+    
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize('has_send_frame', [True, False])
+    async def test_broadcast_reaches_every_client(self, server, monkeypatch, has_send_frame):
+        """Both send paths deliver the same TEXT frame to each client."""
+        monkeypatch.setattr(server_module, '_HAS_SEND_FRAME', has_send_frame)
+        async with app_client(server) as client:
+            sockets = [await client.ws_connect('/ws') for _ in range(3)]
+            for ws in sockets:
+                assert (await ws.receive_json())['type'] == 'connected'
+            await wait_until(lambda: len(server.websockets) == 3)
+            
+            await server._broadcast_websocket({'type': 'note', 'text': 'héllo'})
+            
+            for ws in sockets:
+                msg = await asyncio.wait_for(ws.receive(), 2)
+                assert msg.type is WSMsgType.TEXT
+                assert msg.json() == {'type': 'note', 'text': 'héllo'}
+                await ws.close()
+    
+    @pytest.mark.asyncio
+    async def test_health_counts_connected_plugins_not_sockets(self, server):
+        """A reconnect replacing an open socket still counts as one plugin."""
+        async with app_client(server) as client:
+            await client.post('/api/plugins/register', json={'id': 'p1'})
+            old = await client.ws_connect('/ws/plugin/p1')
+            await old.receive_json()
+            new = await client.ws_connect('/ws/plugin/p1')
+            await new.receive_json()
+            
+            health = await (await client.get('/health')).json()
+            debug = await (await client.get('/debug')).json()
+            assert health['connected_plugins'] == 1
+            assert debug['connected_plugins'] == ['p1']
+            
+            await new.close()
+            await wait_until(lambda: not server.plugin_connections)
+            health = await (await client.get('/health')).json()
+            assert health['connected_plugins'] == 0
+            await old.close()
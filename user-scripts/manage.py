@@ -7,11 +7,13 @@ This script helps manage user-generated scripts in the MCP Desktop Gateway proje
 
 import argparse
 import os
+import re
 import shutil
 import sys
+import time
 from datetime import datetime
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import Dict, Iterator, List, Optional
 
 PROJECT_ROOT = Path(__file__).parent.parent
 USER_SCRIPTS_DIR = PROJECT_ROOT / "user-scripts"
@@ -23,59 +25,121 @@ SUPPORTED_LANGUAGES = {
     'applescript': {'ext': '.applescript', 'dir': 'applescript'}
 }
 
-def get_script_info(script_path: Path) -> Dict:
-    """Extract metadata from script file."""
+# Reverse index: file extension -> (language, language directory)
+LANGUAGE_BY_EXT = {config['ext']: (lang, config['dir']) for lang, config in SUPPORTED_LANGUAGES.items()}
+
+# Template placeholders filled in by create_script, matched in a single pass
+TEMPLATE_PLACEHOLDER_RE = re.compile(r'\[(Brief description of what this script does|YYYY-MM-DD|Creator name/identifier)\]')
+
+# Only this much of each script is read when looking for its description
+HEADER_READ_BYTES = 4096
+
+# Line prefixes that mark a header comment across the supported languages
+COMMENT_PREFIXES = ('#', '//', '(*')
+
+def get_script_info(script_path: Path, st: Optional[os.stat_result] = None, *,
+                    read_description: bool = False) -> Dict:
+    """Extract metadata from script file.
+    
+    Pass ``st`` when the stat result is already known (e.g. from os.scandir).
+    The file header is only opened for a description when ``read_description`` is set.
+    """
+    if st is None:
+        st = script_path.stat()
+    
     info = {
         'name': script_path.name,
         'path': str(script_path),
-        'size': script_path.stat().st_size,
-        'modified': datetime.fromtimestamp(script_path.stat().st_mtime),
+        'size': st.st_size,
+        'modified': datetime.fromtimestamp(st.st_mtime),
         'language': None,
         'description': None
     }
     
     # Determine language from path
-    for lang, config in SUPPORTED_LANGUAGES.items():
-        if script_path.suffix == config['ext'] and config['dir'] in str(script_path):
-            info['language'] = lang
-            break
+    lang, lang_dir = LANGUAGE_BY_EXT.get(script_path.suffix, (None, None))
+    if lang and lang_dir in script_path.parts:
+        info['language'] = lang
+    
+    if read_description:
+        info['description'] = read_script_description(script_path)
     
-    # Try to extract description from file header
+    return info
+
+def read_script_description(script_path: Path) -> Optional[str]:
+    """Extract the description from a script's header comment, if it has one."""
     try:
-        with open(script_path, 'r', encoding='utf-8') as f:
-            lines = f.readlines()[:20]  # Read first 20 lines
+        with open(script_path, 'rb') as f:
+            head = f.read(HEADER_READ_BYTES)
+        
+        # Drop a line cut off by the read limit
+        if len(head) == HEADER_READ_BYTES:
+            head = head[:max(head.rfind(b'\n'), head.rfind(b'\r')) + 1]
+        
+        # Jump straight to each marker instead of parsing every line; only a
+        # comment line within the first 20 lines counts
+        pos = 0
+        while True:
+            hits = [i for i in (head.find(b'Task:', pos), head.find(b'Description:', pos)) if i >= 0]
+            if not hits:
+                return None
+            idx = min(hits)
+            
+            # Lines end in \n, \r\n or a bare \r (classic Mac AppleScript)
+            line_start = max(head.rfind(b'\n', 0, idx), head.rfind(b'\r', 0, idx)) + 1
+            line_breaks = (head.count(b'\n', 0, line_start) + head.count(b'\r', 0, line_start)
+                           - head.count(b'\r\n', 0, line_start))
+            if line_breaks >= 20:
+                return None
+            ends = [i for i in (head.find(b'\n', idx), head.find(b'\r', idx)) if i >= 0]
+            line_end = min(ends) if ends else len(head)
             
-        for line in lines:
-            line = line.strip()
-            if line.startswith('#') or line.startswith('//') or line.startswith('(*'):
-                if 'Task:' in line or 'Description:' in line:
-                    # Extract description after the marker
-                    parts = line.split(':', 1)
-                    if len(parts) > 1:
-                        info['description'] = parts[1].strip()
-                        break
+            line = head[line_start:line_end].decode('utf-8', errors='replace').strip()
+            if line.startswith(COMMENT_PREFIXES):
+                # Extract description after the marker
+                return line.split(':', 1)[1].strip()
+            pos = line_end
     except Exception:
         pass
     
-    return info
+    return None
 
-def list_scripts(language: Optional[str] = None, category: str = 'active') -> List[Dict]:
-    """List all scripts in the specified category."""
-    scripts = []
-    
+def iter_scripts(language: Optional[str] = None, category: str = 'active', *,
+                 read_description: bool = False) -> Iterator[Dict]:
+    """Yield scripts in the specified category as each directory is walked."""
     languages = [language] if language else SUPPORTED_LANGUAGES.keys()
     
     for lang in languages:
         lang_dir = USER_SCRIPTS_DIR / SUPPORTED_LANGUAGES[lang]['dir'] / category
-        if not lang_dir.exists():
+        ext = SUPPORTED_LANGUAGES[lang]['ext']
+        
+        try:
+            entries = os.scandir(lang_dir)
+        except FileNotFoundError:
             continue
-            
-        for script_file in lang_dir.glob(f"*{SUPPORTED_LANGUAGES[lang]['ext']}"):
-            if script_file.name == '.gitkeep':
-                continue
-            scripts.append(get_script_info(script_file))
-    
-    return scripts
+        
+        # Walk the directory once and filter names here rather than via glob
+        with entries:
+            for entry in entries:
+                if not entry.name.endswith(ext) or not entry.is_file():
+                    continue
+                yield get_script_info(Path(entry.path), entry.stat(), read_description=read_description)
+
+def list_scripts(language: Optional[str] = None, category: str = 'active', *,
+                 read_description: bool = False) -> List[Dict]:
+    """List all scripts in the specified category."""
+    return list(iter_scripts(language, category, read_description=read_description))
+
+def find_script(script_name: str, language: Optional[str] = None,
+                categories: tuple = ('active',)) -> Optional[Dict]:
+    """Return the first script whose name contains script_name, stopping at the first match."""
+    return next(
+        (script
+         for category in categories
+         for script in iter_scripts(language, category)
+         if script_name in script['name']),
+        None
+    )
 
 def create_script(name: str, language: str, description: str = "") -> Path:
     """Create a new script from template."""
@@ -96,18 +160,18 @@ def create_script(name: str, language: str, description: str = "") -> Path:
     template_path = USER_SCRIPTS_DIR / config['dir'] / 'templates' / f"basic_script{config['ext']}"
     
     if template_path.exists():
-        shutil.copy2(template_path, script_path)
+        # Read the template once, fill in placeholders, write the script once
+        content = template_path.read_text(encoding='utf-8')
         
-        # Update template placeholders
-        with open(script_path, 'r', encoding='utf-8') as f:
-            content = f.read()
+        substitutions = {
+            'Brief description of what this script does': description or f"Task: {name}",
+            'YYYY-MM-DD': date_str,
+            'Creator name/identifier': "User",
+        }
+        content = TEMPLATE_PLACEHOLDER_RE.sub(lambda m: substitutions[m.group(1)], content)
         
-        content = content.replace('[Brief description of what this script does]', description or f"Task: {name}")
-        content = content.replace('[YYYY-MM-DD]', date_str)
-        content = content.replace('[Creator name/identifier]', "User")
-        
-        with open(script_path, 'w', encoding='utf-8') as f:
-            f.write(content)
+        script_path.write_text(content, encoding='utf-8')
+        shutil.copymode(template_path, script_path)  # Keep the template's permissions
     else:
         # Create minimal script if no template
         with open(script_path, 'w', encoding='utf-8') as f:
@@ -118,13 +182,7 @@ def create_script(name: str, language: str, description: str = "") -> Path:
 def archive_script(script_name: str, language: Optional[str] = None) -> bool:
     """Move a script from active to archived."""
     # Find the script
-    scripts = list_scripts(language, 'active')
-    target_script = None
-    
-    for script in scripts:
-        if script_name in script['name']:
-            target_script = script
-            break
+    target_script = find_script(script_name, language, ('active',))
     
     if not target_script:
         return False
@@ -145,13 +203,7 @@ def archive_script(script_name: str, language: Optional[str] = None) -> bool:
 def restore_script(script_name: str, language: Optional[str] = None) -> bool:
     """Move a script from archived to active."""
     # Find the script
-    scripts = list_scripts(language, 'archived')
-    target_script = None
-    
-    for script in scripts:
-        if script_name in script['name']:
-            target_script = script
-            break
+    target_script = find_script(script_name, language, ('archived',))
     
     if not target_script:
         return False
@@ -172,16 +224,22 @@ def restore_script(script_name: str, language: Optional[str] = None) -> bool:
 def clean_logs(days: int = 7) -> int:
     """Clean old log files."""
     logs_dir = USER_SCRIPTS_DIR / 'shared' / 'logs'
-    if not logs_dir.exists():
-        return 0
-    
-    cutoff_time = datetime.now().timestamp() - (days * 24 * 60 * 60)
+    cutoff_time = time.time() - (days * 24 * 60 * 60)
     cleaned = 0
     
-    for log_file in logs_dir.glob('*.log'):
-        if log_file.stat().st_mtime < cutoff_time:
-            log_file.unlink()
-            cleaned += 1
+    try:
+        entries = os.scandir(logs_dir)
+    except FileNotFoundError:
+        return 0
+    
+    # One directory walk; DirEntry supplies the stat data for each log
+    with entries:
+        for entry in entries:
+            if not entry.name.endswith('.log') or entry.is_dir():
+                continue
+            if entry.stat(follow_symlinks=False).st_mtime < cutoff_time:
+                os.unlink(entry.path)
+                cleaned += 1
     
     return cleaned
 
@@ -193,7 +251,7 @@ def main():
     list_parser = subparsers.add_parser('list', help='List scripts')
     list_parser.add_argument('--language', '-l', choices=SUPPORTED_LANGUAGES.keys(), help='Filter by language')
     list_parser.add_argument('--category', '-c', choices=['active', 'archived'], default='active', help='Category to list')
-    list_parser.add_argument('--verbose', '-v', action='store_true', help='Show detailed information')
+    list_parser.add_argument('--verbose', '-v', action='store_true', help='Show detailed information (descriptions and paths)')
     
     # Create command
     create_parser = subparsers.add_parser('create', help='Create new script from template')
@@ -227,7 +285,7 @@ def main():
     
     try:
         if args.command == 'list':
-            scripts = list_scripts(args.language, args.category)
+            scripts = list_scripts(args.language, args.category, read_description=args.verbose)
             
             if not scripts:
                 print(f"No {args.category} scripts found" + (f" for {args.language}" if args.language else ""))
@@ -273,15 +331,12 @@ def main():
             print(f"🧹 Cleaned {cleaned} log files older than {args.days} days")
             
         elif args.command == 'info':
-            scripts = list_scripts(None, 'active') + list_scripts(None, 'archived')
-            target_script = None
-            
-            for script in scripts:
-                if args.script_name in script['name']:
-                    target_script = script
-                    break
+            # Stop at the first match and only read that script's header
+            target_script = find_script(args.script_name, None, ('active', 'archived'))
             
             if target_script:
+                target_script['description'] = read_script_description(Path(target_script['path']))
+                
                 print(f"📄 Script Information")
                 print(f"{'=' * 40}")
                 print(f"Name: {target_script['name']}")